@@ -1,11 +1,23 @@
 """Singleton dependency providers for the API."""
 
-from functools import lru_cache
+import threading
 
 from src.rag import RAG
 
+_rag: RAG | None = None
+_rag_lock = threading.Lock()
+
 
-@lru_cache(maxsize=1)
 def get_rag() -> RAG:
-    """Return a process-wide RAG instance (loaded on first request)."""
-    return RAG()
+    """Return the process-wide RAG instance.
+
+    Built by the startup warmup thread or by the first request, whichever
+    comes first; the lock makes an early request share the instance being
+    warmed instead of building a second, cold one.
+    """
+    global _rag
+    if _rag is None:
+        with _rag_lock:
+            if _rag is None:
+                _rag = RAG()
+    return _rag
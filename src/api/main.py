@@ -2,12 +2,15 @@
 
 import logging
 import os
+import threading
+from contextlib import asynccontextmanager
 from pathlib import Path
 
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 
+from src.api.deps import get_rag
 from src.api.routes import chat, health
 from src.version import __version__
 
@@ -30,10 +33,27 @@ class _NoiseFilter(logging.Filter):
 
 logging.getLogger("uvicorn.access").addFilter(_NoiseFilter())
 
+
+def _warmup() -> None:
+    try:
+        get_rag().warmup()
+    except Exception as e:
+        logging.getLogger(__name__).warning("Startup warmup failed: %s", e)
+
+
+@asynccontextmanager
+async def lifespan(_: FastAPI):
+    # Load the RAG and open its connections in the background so the first
+    # chat request does not pay for them; health checks answer immediately.
+    threading.Thread(target=_warmup, daemon=True).start()
+    yield
+
+
 app = FastAPI(
     title="LégiRoute API",
     description="HTTP API for the LégiRoute RAG assistant (French Highway Code).",
     version=__version__,
+    lifespan=lifespan,
 )
 
 default_origins = "http://localhost:5173,http://127.0.0.1:5173"
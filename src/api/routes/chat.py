@@ -33,27 +33,49 @@ def _stream_chat(req: ChatRequest, rag: RAG) -> Iterator[str]:
     prompt = req.prompt
     t0 = time.monotonic()
 
-    # Classify on the original prompt and rewrite for retrieval in parallel.
-    # Intent is stable under query rewriting so classify doesn't need the rewrite.
-    # A third task chains off rewrite: as soon as the rewritten query is ready it
-    # immediately embeds it, running in parallel with the (slow) classify call.
-    executor = ThreadPoolExecutor(max_workers=3)
-    classify_future = executor.submit(rag.classifier.classify, prompt)
-    rewrite_future = executor.submit(rag.rewrite_query, prompt, history)
+    executor = ThreadPoolExecutor(max_workers=4)
 
-    def _rewrite_then_embed() -> tuple[str, list[float]]:
-        sq = rewrite_future.result()
-        vec = rag.retriever.provider.embed([sq], "query")[0]
-        return sq, vec
-
-    retrieval_future = executor.submit(_rewrite_then_embed)
+    def _rewrite_then_embed(prompt_vector=None) -> tuple[str, list[float]]:
+        sq = rag.rewrite_query(prompt, history)
+        if sq == prompt and prompt_vector is not None:
+            return sq, prompt_vector.result()
+        return sq, rag.retriever.embed_query(sq)
 
     try:
-        try:
-            intent = classify_future.result()
-        except Exception as e:
-            logger.error("Classification unavailable: %s", e)
-            intent = Intent.LEGAL_QUERY
+        # Greetings and repeated questions are answered locally, before any
+        # rewrite or embedding is started for them.
+        intent = rag.classifier.classify_fast(prompt)
+        retrieval_future = None
+        if intent is None:
+            # Classify on the original prompt and rewrite for retrieval in parallel.
+            # Intent is stable under query rewriting so classify doesn't need the rewrite.
+            # The prompt is embedded up front only when that vector will be used:
+            # by the local intent router, or by retrieval when there is no history
+            # (the rewrite then leaves the prompt unchanged).
+            embed_future = None
+            if settings.INTENT_ROUTER_ENABLED or not history:
+                embed_future = executor.submit(rag.retriever.embed_query, prompt)
+
+            def _classify() -> Intent:
+                vec = None
+                if settings.INTENT_ROUTER_ENABLED:
+                    try:
+                        vec = embed_future.result()
+                    except Exception as e:
+                        logger.warning("Query embedding unavailable for routing: %s", e)
+                # embed=False: a failed prefetch must not start a second retried embedding.
+                return rag.classify(prompt, vector=vec, embed=False)
+
+            classify_future = executor.submit(_classify)
+            retrieval_future = executor.submit(_rewrite_then_embed, embed_future)
+            try:
+                intent = classify_future.result()
+            except Exception as e:
+                logger.error("Classification unavailable: %s", e)
+                intent = Intent.LEGAL_QUERY
+        elif intent == Intent.LEGAL_QUERY:
+            retrieval_future = executor.submit(_rewrite_then_embed)
+
         yield sse("intent", {"intent": intent.value})
 
         if intent == Intent.OFF_TOPIC:
@@ -65,8 +87,9 @@ def _stream_chat(req: ChatRequest, rag: RAG) -> Iterator[str]:
         if intent == Intent.LEGAL_QUERY:
             try:
                 search_query, query_vector = retrieval_future.result()
-                results = rag.retriever.search_by_vector(query_vector, k=req.k)
-                sources = [r for r in results if r.score > settings.RELEVANCE_THRESHOLD]
+                sources = rag.retriever.search_by_vector(
+                    query_vector, k=req.k, min_score=settings.RELEVANCE_THRESHOLD
+                )
             except Exception as e:
                 logger.error("Retrieval unavailable: %s", e)
                 yield sse("token", {"text": _UNAVAILABLE_MSG})
@@ -1,10 +1,13 @@
 """Server-Sent Events helpers."""
 
-import json
 from typing import Any
 
+from pydantic_core import to_json
+
 
 def sse(event: str, data: Any) -> str:
     """Format a single SSE message. Each line is JSON-encoded."""
-    payload = json.dumps(data, ensure_ascii=False)
+    # pydantic-core leaves non-ASCII unescaped (like ensure_ascii=False) and is
+    # several times faster than json.dumps; this runs once per streamed chunk.
+    payload = to_json(data).decode()
     return f"event: {event}\ndata: {payload}\n\n"
@@ -2,6 +2,8 @@ import logging
 import time
 import streamlit as st
 import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
@@ -19,6 +21,9 @@ logger = logging.getLogger(__name__)
 
 _UNAVAILABLE_MSG = "Le service est momentanément surchargé. Veuillez réessayer dans quelques instants."
 
+# Re-rendering the whole markdown on every token is O(n²); redraw at most ~20 times/s.
+_STREAM_FLUSH_INTERVAL = 0.05
+
 _LOGO_PATH = PROJECT_ROOT / "assets" / "logo.svg"
 _LOGO_SVG = _LOGO_PATH.read_text(encoding="utf-8") if _LOGO_PATH.exists() else ""
 
@@ -73,7 +78,10 @@ st.caption("Assistant Juridique — Code de la Route Français")
 @st.cache_resource
 def load_rag():
     from src.rag import RAG
-    return RAG()
+    rag = RAG()
+    # Keep the first user query from paying connection setup and anchor embedding.
+    threading.Thread(target=rag.warmup, daemon=True).start()
+    return rag
 
 
 tl_loading = st.empty()
@@ -105,14 +113,53 @@ if prompt := st.chat_input("Ex: Sanction pour téléphone au volant ?"):
         full_response = ""
         sources = []
 
-        try:
-            intent = rag.classifier.classify(prompt)
-        except Exception as e:
-            logger.error("Classification unavailable: %s", e)
-            intent = Intent.LEGAL_QUERY
+        pool = ThreadPoolExecutor(max_workers=4)
+
+        def _rewrite_then_search(prompt_vector=None) -> tuple[str, list]:
+            sq = rag.rewrite_query(prompt, history)
+            if sq == prompt and prompt_vector is not None:
+                vec = prompt_vector.result()
+            else:
+                vec = rag.retriever.embed_query(sq)
+            return sq, rag.retriever.search_by_vector(vec, k=3)
+
+        # Greetings and repeated questions are answered locally, before any
+        # rewrite, embedding or search is started for them.
+        intent = rag.classifier.classify_fast(prompt)
+        retrieval_future = None
+        if intent is None:
+            # Classify and retrieve concurrently: the retrieval result is simply
+            # discarded when the intent turns out not to be a legal query. The
+            # prompt is embedded up front only when that vector will be used: by
+            # the intent router, or by the search when there is no history.
+            embed_future = None
+            if settings.INTENT_ROUTER_ENABLED or not history:
+                embed_future = pool.submit(rag.retriever.embed_query, prompt)
+
+            def _classify() -> Intent:
+                vec = None
+                if settings.INTENT_ROUTER_ENABLED:
+                    try:
+                        vec = embed_future.result()
+                    except Exception as e:
+                        logger.warning("Query embedding unavailable for routing: %s", e)
+                # embed=False: a failed prefetch must not start a second retried embedding.
+                return rag.classify(prompt, vector=vec, embed=False)
+
+            classify_future = pool.submit(_classify)
+            retrieval_future = pool.submit(_rewrite_then_search, embed_future)
+            try:
+                intent = classify_future.result()
+            except Exception as e:
+                logger.error("Classification unavailable: %s", e)
+                intent = Intent.LEGAL_QUERY
+        elif intent == Intent.LEGAL_QUERY:
+            retrieval_future = pool.submit(_rewrite_then_search)
 
         logger.info("query | intent=%s | turn=%d | q=%s", intent.value, len(history) // 2 + 1, prompt[:120])
 
+        # A retrieval already running for a non-legal intent is left to finish
+        # in the background (Future.cancel() cannot stop it) and ignored.
         if intent == Intent.OFF_TOPIC:
             full_response = "Je suis spécialisé dans le Code de la Route. Je ne peux pas répondre à cette question."
         else:
@@ -120,10 +167,9 @@ if prompt := st.chat_input("Ex: Sanction pour téléphone au volant ?"):
                 tl = st.empty()
                 tl.markdown(_traffic_light("red", "Recherche..."), unsafe_allow_html=True)
                 try:
-                    search_query = rag.rewrite_query(prompt, history)
+                    search_query, results = retrieval_future.result()
                     if search_query != prompt:
                         logger.info("rewrite | %s -> %s", prompt[:80], search_query[:80])
-                    results = rag.retriever.search(search_query, k=3)
                     sources = [r for r in results if r.score > settings.RELEVANCE_THRESHOLD]
                     logger.info("retrieval | sources=%d | top_score=%.3f", len(sources), results[0].score if results else 0)
                 except Exception as e:
@@ -131,23 +177,39 @@ if prompt := st.chat_input("Ex: Sanction pour téléphone au volant ?"):
                     full_response = _UNAVAILABLE_MSG
                 tl.empty()
 
-                if sources:
-                    with st.expander(f"📚 {len(sources)} articles consultés"):
-                        for r in sources:
-                            st.markdown(f"[**{r.article.article_number}**]({r.article.full_url})")
-                            text = r.article.content
-                            st.caption(text[:250] + "..." if len(text) > 250 else text)
-                            st.divider()
+            if not full_response:
+                # Generator bodies only run on the first next(): fetch the first
+                # chunk in the background so the request is in flight while the
+                # sources panel renders.
+                stream = rag.generator.generate_stream(prompt, sources, history=history)
+                first_chunk = pool.submit(next, stream, "")
+
+            if sources:
+                with st.expander(f"📚 {len(sources)} articles consultés"):
+                    for r in sources:
+                        st.markdown(f"[**{r.article.article_number}**]({r.article.full_url})")
+                        text = r.article.content
+                        st.caption(text[:250] + "..." if len(text) > 250 else text)
+                        st.divider()
 
             if not full_response:
                 try:
-                    for chunk in rag.generator.generate_stream(prompt, sources, history=history):
-                        full_response += chunk
-                        placeholder.markdown(full_response + "▌")
+                    parts = [first_chunk.result()]
+                    # Paint the first chunk as soon as it arrives: that is the TTFT.
+                    placeholder.markdown(parts[0] + "▌")
+                    last_flush = time.monotonic()
+                    for chunk in stream:
+                        parts.append(chunk)
+                        now = time.monotonic()
+                        if now - last_flush >= _STREAM_FLUSH_INTERVAL:
+                            placeholder.markdown("".join(parts) + "▌")
+                            last_flush = now
+                    full_response = "".join(parts)
                 except Exception as e:
                     full_response = _UNAVAILABLE_MSG
                     logger.error("generation error | %s | q=%s", e, prompt[:80])
 
+        pool.shutdown(wait=False)
         placeholder.markdown(full_response)
 
         tl_done = st.empty()
@@ -0,0 +1,56 @@
+"""
+Thread-safe in-process LRU cache for query-time results.
+"""
+
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+def normalize_query(text: str) -> str:
+    """Cache key for a user query: Unicode form, case and whitespace are ignored."""
+    return " ".join(unicodedata.normalize("NFKC", text).lower().split())
+
+
+class LRUCache:
+    """Bounded mapping that evicts the least recently used entry.
+
+    With `ttl` (seconds), entries also expire that long after being stored.
+    """
+
+    def __init__(self, maxsize: int, ttl: Optional[float] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self._data: OrderedDict[Hashable, tuple[float, Any]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        with self._lock:
+            try:
+                expires, value = self._data[key]
+            except KeyError:
+                return default
+            if expires < time.monotonic():
+                del self._data[key]
+                return default
+            self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: Any) -> None:
+        if self.maxsize <= 0:
+            return
+        expires = time.monotonic() + self.ttl if self.ttl else float("inf")
+        with self._lock:
+            self._data[key] = (expires, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
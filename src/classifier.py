@@ -1,7 +1,12 @@
-import json
 import logging
+import re
+import threading
 from enum import Enum
 
+import numpy as np
+
+from src.cache import LRUCache, normalize_query
+from src.config import settings, CHITCHAT_KEYWORDS, MAX_CHITCHAT_LENGTH
 from src.providers import LLMProvider
 
 logger = logging.getLogger(__name__)
@@ -34,19 +39,149 @@ INTENT_SCHEMA = {
     "required": ["intent"],
 }
 
+# Canonical phrases per intent. Embedded once, they act as nearest-neighbour
+# anchors for the local router so most queries skip the classifier LLM call.
+INTENT_ANCHORS = {
+    Intent.LEGAL_QUERY: (
+        "Quelle est la sanction pour excès de vitesse ?",
+        "Quelle est la vitesse maximale autorisée sur autoroute ?",
+        "Quel est le taux d'alcool autorisé au volant ?",
+        "Combien de points perd-on pour un téléphone tenu en main en conduisant ?",
+        "Le stationnement sur un trottoir est-il interdit ?",
+    ),
+    Intent.CHITCHAT: (
+        "Bonjour, ça va ?",
+        "Merci beaucoup pour ton aide !",
+        "Qui es-tu ?",
+        "Salut !",
+        "Au revoir, bonne journée.",
+    ),
+    Intent.OFF_TOPIC: (
+        "Quelle est la recette des pâtes carbonara ?",
+        "Qui a gagné la coupe du monde de football ?",
+        "Quel temps fera-t-il demain à Paris ?",
+        "Comment soigner un rhume ?",
+        "Pour qui voter aux prochaines élections ?",
+    ),
+}
+
+# Whole message made of greeting keywords and punctuation, e.g. "Bonjour !",
+# "merci beaucoup". Anchored on both ends so "Salut, vitesse max ?" is not matched.
+# Longest keywords first so "merci beaucoup" is tried before "merci"; \b keeps
+# run-together words ("okmerci") from being read as two keywords.
+_CHITCHAT_RE = re.compile(
+    r"^[\W_]*(?:(?:"
+    + "|".join(map(re.escape, sorted(CHITCHAT_KEYWORDS, key=lambda k: (-len(k), k))))
+    + r")\b[\W_]*)+$",
+    re.IGNORECASE,
+)
+_GREETING_PUNCTUATION = " \t\n!?.,;:…"
+
+
+def _is_greeting(query: str) -> bool:
+    """True for short messages made only of chitchat keywords."""
+    if len(query) >= MAX_CHITCHAT_LENGTH:
+        return False
+    # Single keyword ("Bonjour !"): O(1) set lookup before scanning with the regex.
+    if query.strip(_GREETING_PUNCTUATION).lower() in CHITCHAT_KEYWORDS:
+        return True
+    return _CHITCHAT_RE.match(query) is not None
+
+
+# Number of best-matching anchors averaged per intent.
+_ANCHOR_TOP_K = 2
+
 
 class IntentClassifier:
 
     def __init__(self, provider: LLMProvider):
         self.provider = provider
+        self._anchors: np.ndarray | None = None
+        self._anchor_labels: np.ndarray | None = None
+        self._anchor_lock = threading.Lock()
+        self._cache = LRUCache(settings.QUERY_CACHE_SIZE)
+
+    def _load_anchors(self) -> np.ndarray:
+        """Embed the anchor phrases once (single batched call), unit-normalized."""
+        if self._anchors is None:
+            with self._anchor_lock:
+                if self._anchors is None:
+                    labels, phrases = [], []
+                    for intent, examples in INTENT_ANCHORS.items():
+                        labels.extend([intent] * len(examples))
+                        phrases.extend(examples)
+                    vectors = np.asarray(self.provider.embed(phrases, task_type="query"), dtype=np.float32)
+                    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+                    self._anchor_labels = np.asarray([i.value for i in labels])
+                    self._anchors = vectors
+        return self._anchors
+
+    def warmup(self) -> None:
+        """Embed the routing anchors ahead of the first query. Best effort."""
+        if not settings.INTENT_ROUTER_ENABLED:
+            return
+        try:
+            self._load_anchors()
+        except Exception as e:
+            logger.warning(f"Intent anchor warmup failed: {e}")
+
+    def classify_by_vector(self, vector: list[float]) -> Intent | None:
+        """Route a query embedding to the closest intent anchors.
+
+        Returns None when the best intent is not similar enough (or not clearly
+        ahead of the runner-up) to be trusted without asking the LLM.
+        """
+        anchors = self._load_anchors()
+        q = np.asarray(vector, dtype=np.float32)
+        q /= np.linalg.norm(q)
+        scores = anchors @ q
+
+        per_intent = {
+            intent: float(np.sort(scores[self._anchor_labels == intent.value])[-_ANCHOR_TOP_K:].mean())
+            for intent in INTENT_ANCHORS
+        }
+        ranked = sorted(per_intent.items(), key=lambda kv: kv[1], reverse=True)
+        (best, best_score), (_, second_score) = ranked[0], ranked[1]
+        if best_score < settings.INTENT_ROUTER_MIN_SCORE:
+            return None
+        if best_score - second_score < settings.INTENT_ROUTER_MIN_MARGIN:
+            return None
+        return best
+
+    def classify_fast(self, query: str) -> Intent | None:
+        """Answer from the checks that need no API call, or None when they all miss.
 
-    def classify(self, query: str) -> Intent:
+        Covers empty and trivial messages, greetings and previously classified queries.
+        """
         if not query or len(query.strip()) < 2:
             return Intent.CHITCHAT
 
+        if _is_greeting(query):
+            return Intent.CHITCHAT
+
+        return self._cache.get(normalize_query(query))
+
+    def classify(self, query: str, vector: list[float] | None = None) -> Intent:
+        intent = self.classify_fast(query)
+        if intent is not None:
+            return intent
+
+        key = normalize_query(query)
+        if vector is not None and settings.INTENT_ROUTER_ENABLED:
+            try:
+                intent = self.classify_by_vector(vector)
+            except Exception as e:
+                logger.warning(f"Local intent routing failed: {e}. Falling back to LLM.")
+                intent = None
+            if intent is not None:
+                self._cache.put(key, intent)
+                return intent
+
         try:
             data = self.provider.classify_intent(query, CLASSIFICATION_PROMPT)
-            return Intent(data["intent"])
+            intent = Intent(data["intent"])
+            self._cache.put(key, intent)
+            return intent
         except Exception as e:
             logger.warning(f"Classification failed: {e}. Defaulting to LEGAL_QUERY.")
             return Intent.LEGAL_QUERY
@@ -0,0 +1,27 @@
+"""
+Process-wide API clients, created lazily and shared by every caller.
+"""
+
+from functools import lru_cache
+
+from src.config import settings
+
+
+@lru_cache(maxsize=1)
+def get_genai_client():
+    """Shared google-genai client: a single HTTP connection pool for all Gemini calls."""
+    from google import genai
+    return genai.Client(api_key=settings.GOOGLE_API_KEY)
+
+
+@lru_cache(maxsize=1)
+def get_pinecone_client():
+    """Shared Pinecone client, so every retriever reuses one connection pool."""
+    from pinecone import Pinecone
+    return Pinecone(api_key=settings.PINECONE_API_KEY)
+
+
+@lru_cache(maxsize=None)
+def get_pinecone_index(name: str):
+    """Data-plane handle for index `name`, built once per process."""
+    return get_pinecone_client().Index(name)
@@ -1,4 +1,5 @@
 from enum import Enum
+from functools import cached_property
 from pathlib import Path
 from pydantic_settings import BaseSettings
 from pydantic import Field
@@ -53,7 +54,8 @@ class Settings(BaseSettings):
 
     PROJECT_ROOT: Path = Path(__file__).resolve().parent.parent
 
-    @property
+    # Derived paths are built once per Settings instance, not on every access.
+    @cached_property
     def RAW_DATA_DIR(self) -> Path:
         return (
             self.PROJECT_ROOT / "data" / "raw" / "LEGI" / "TEXT"
@@ -61,7 +63,7 @@ class Settings(BaseSettings):
             / "LEGITEXT000006074228" / "article"
         )
 
-    @property
+    @cached_property
     def PROCESSED_FILE(self) -> Path:
         return self.PROJECT_ROOT / "data" / "processed" / "code_route_articles.json"
 
@@ -87,8 +89,15 @@ class Settings(BaseSettings):
         return PROVIDER_EMBEDDING_DIMENSIONS[self.PROVIDER]
 
     # Indexing (batch)
-    BATCH_SIZE: int = 5
-    SLEEP_BETWEEN_BATCHES: int = 5
+    # Batches are packed up to BATCH_SIZE texts or EMBEDDING_BATCH_MAX_TOKENS
+    # (estimated at 4 characters per token), whichever comes first.
+    BATCH_SIZE: int = 100
+    EMBEDDING_BATCH_MAX_TOKENS: int = 20_000
+    EMBEDDING_TOKENS_PER_MINUTE: int = 30_000  # provider quota; 0 disables pacing
+    EMBEDDING_CONCURRENCY: int = 1  # in-flight embedding requests; raise on paid tiers
+    # Vectors per Pinecone upsert request, independent of embedding batches:
+    # 3072-dim vectors plus article text must stay under the 2 MB request limit.
+    UPSERT_BATCH_SIZE: int = 50
     MAX_RETRIES: int = 20
     RETRY_MIN_WAIT: int = 10
     RETRY_MAX_WAIT: int = 120
@@ -98,6 +107,17 @@ class Settings(BaseSettings):
     QUERY_RETRY_MIN_WAIT: float = 1.0
     QUERY_RETRY_MAX_WAIT: float = 8.0
 
+    # Intent routing (local embedding router, LLM fallback below these bounds).
+    # Off by default: the thresholds have not been measured against eval/test_questions.csv,
+    # and a legal question misrouted to OFF_TOPIC is refused without a trace.
+    INTENT_ROUTER_ENABLED: bool = False
+    INTENT_ROUTER_MIN_SCORE: float = 0.75
+    INTENT_ROUTER_MIN_MARGIN: float = 0.05
+
+    # Query-time caches (entries per process, seconds before an entry expires)
+    QUERY_CACHE_SIZE: int = 512
+    QUERY_CACHE_TTL: int = 3600
+
     # Retrieval
     DEFAULT_TOP_K: int = 5
     RELEVANCE_THRESHOLD: float = 0.5
@@ -116,3 +136,17 @@ class Settings(BaseSettings):
 settings = Settings()
 
 HISTORY_WINDOW = 3
+
+# Classifier labels, shared by the Intent enum (classifier.py) and the
+# providers that scan raw classifier output for them.
+INTENT_VALUES = ("LEGAL_QUERY", "CHITCHAT", "OFF_TOPIC")
+
+# Messages made only of these words (and punctuation) are chitchat without
+# asking the classifier. Kept to unambiguous greetings and acknowledgements.
+CHITCHAT_KEYWORDS = frozenset({
+    "bonjour", "bonsoir", "salut", "coucou", "hello", "hey",
+    "merci", "merci beaucoup", "au revoir", "bonne journée", "bonne soirée",
+    "ça va", "ca va", "qui es-tu", "qui es tu",
+    "ok", "d'accord", "super", "parfait", "génial",
+})
+MAX_CHITCHAT_LENGTH = 40
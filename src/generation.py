@@ -1,31 +1,41 @@
 import logging
+import time
 from typing import Iterator
 
-from src.config import HISTORY_WINDOW
+from src.cache import LRUCache
+from src.config import HISTORY_WINDOW, settings
 from src.models import RetrievalResult
 from src.providers import LLMProvider
 
 logger = logging.getLogger(__name__)
 
+# Streamed tokens are regrouped so callers re-render at most ~25 times a second.
+STREAM_FLUSH_CHARS = 32
+STREAM_FLUSH_INTERVAL = 0.04
+
 SYSTEM_PROMPT = """Tu es **LégiRoute**, un assistant juridique spécialisé dans le Code de la Route français.
 
-        RÈGLES STRICTES :
-        1. **NE TE PRÉSENTE JAMAIS** spontanément. Réponds directement à la question posée. Tu ne dois mentionner ton nom ou ta nature que si l'utilisateur te demande explicitement qui tu es.
-        2. **CITATIONS OBLIGATOIRES** : Pour toute question juridique, cite les articles de loi (ex: "Selon l'article R413-17...").
-        3. **PAS D'INVENTION** : Ne cite que les articles fournis dans le contexte. Si aucun article pertinent n'est disponible, dis-le honnêtement.
-        4. **STYLE** : Réponds de manière concise et structurée. Va droit au but.
-        5. **HORS SUJET** : Si la question n'est pas liée au Code de la Route, réponds naturellement sans inventer de citations juridiques.
-        """
+RÈGLES STRICTES :
+1. **NE TE PRÉSENTE JAMAIS** spontanément. Réponds directement à la question posée. Tu ne dois mentionner ton nom ou ta nature que si l'utilisateur te demande explicitement qui tu es.
+2. **CITATIONS OBLIGATOIRES** : Pour toute question juridique, cite les articles de loi (ex: "Selon l'article R413-17...").
+3. **PAS D'INVENTION** : Ne cite que les articles fournis dans le contexte. Si aucun article pertinent n'est disponible, dis-le honnêtement.
+4. **STYLE** : Réponds de manière concise et structurée. Va droit au but.
+5. **HORS SUJET** : Si la question n'est pas liée au Code de la Route, réponds naturellement sans inventer de citations juridiques."""
+
+
+_NO_ARTICLES_MSG = "AUCUN ARTICLE TROUVÉ."
 
 
 class TrafficGenerator:
 
     def __init__(self, provider: LLMProvider):
         self.provider = provider
+        # Full answers keyed by the exact prompt (question, sources and history).
+        self._answers = LRUCache(settings.QUERY_CACHE_SIZE, ttl=settings.QUERY_CACHE_TTL)
 
     def _format_context(self, results: list[RetrievalResult]) -> str:
         if not results:
-            return "AUCUN ARTICLE TROUVÉ."
+            return _NO_ARTICLES_MSG
 
         parts = []
         for i, res in enumerate(results, 1):
@@ -49,7 +59,47 @@ class TrafficGenerator:
         history_block = self._format_history(history) if history else ""
         context = self._format_context(results)
         prompt = f"{history_block}CONTEXTE JURIDIQUE :\n{context}\n\nQUESTION :\n{query}\n\nRÉPONSE :"
-        yield from self.provider.generate_stream(prompt, SYSTEM_PROMPT)
+
+        # Only deterministic (temperature 0) answers are worth replaying.
+        cacheable = settings.GENERATION_TEMPERATURE == 0
+        if cacheable:
+            cached = self._answers.get(prompt)
+            if cached is not None:
+                yield cached
+                return
+
+        chunks = []
+        for chunk in self._coalesce(self.provider.generate_stream(prompt, SYSTEM_PROMPT)):
+            chunks.append(chunk)
+            yield chunk
+        if cacheable and chunks:
+            self._answers.put(prompt, "".join(chunks))
+
+    @staticmethod
+    def _coalesce(pieces: Iterator[str]) -> Iterator[str]:
+        """Merge single-token pieces into larger chunks.
+
+        The first piece is passed through untouched to keep time-to-first-token;
+        later ones are buffered until enough text, time or a line break accumulates.
+        """
+        buffer: list[str] = []
+        size = 0
+        last = None
+        for piece in pieces:
+            if last is None:
+                last = time.monotonic()
+                yield piece
+                continue
+            buffer.append(piece)
+            size += len(piece)
+            now = time.monotonic()
+            if size > STREAM_FLUSH_CHARS or now - last > STREAM_FLUSH_INTERVAL or piece.endswith((". ", "\n")):
+                yield "".join(buffer)
+                buffer.clear()
+                size = 0
+                last = now
+        if buffer:
+            yield "".join(buffer)
 
     def generate(self, query: str, results: list[RetrievalResult], history: list[dict] | None = None) -> str:
         return "".join(self.generate_stream(query, results, history))
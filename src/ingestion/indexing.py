@@ -1,12 +1,17 @@
-import json
 import logging
+import threading
 import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from itertools import chain
+from typing import Iterable, Iterator
 from tqdm import tqdm
 from pinecone import Pinecone, ServerlessSpec
 from tenacity import retry, stop_after_attempt, wait_exponential, before_sleep_log, retry_if_exception
 
+from src.clients import get_pinecone_client, get_pinecone_index
 from src.config import settings
-from src.models import TrafficLawArticle
+from src.models import ARTICLE_LIST_ADAPTER, TrafficLawArticle
 from src.providers import get_provider, LLMProvider
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
@@ -22,24 +27,153 @@ def _is_retriable(exc):
     return True
 
 
+def _is_rate_limited(exc: Exception) -> bool:
+    exc_str = str(exc).lower()
+    return any(p in exc_str for p in ("429", "resource_exhausted", "rate", "quota"))
+
+
+class TokenBucket:
+    """Thread-safe token bucket pacing embedding requests, with AIMD on rate limits.
+
+    The bucket holds up to one minute of quota and refills continuously at
+    tokens_per_minute. Each 429 halves the refill rate; every run of successes
+    adds back a tenth of the configured rate.
+    """
+
+    SUCCESS_STREAK = 5
+
+    def __init__(self, tokens_per_minute: int):
+        self.max_rate = tokens_per_minute / 60.0
+        self.rate = self.max_rate
+        self.capacity = float(tokens_per_minute)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._successes = 0
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self, tokens: int) -> None:
+        """Block until `tokens` are available, then take them."""
+        if self.max_rate <= 0:
+            return
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            self._refill()
+            if self._tokens < tokens:
+                time.sleep((tokens - self._tokens) / self.rate)
+                self._refill()
+            self._tokens -= tokens
+
+    def on_rate_limited(self) -> None:
+        with self._lock:
+            self._successes = 0
+            self.rate = max(self.rate / 2, self.max_rate / 64)
+
+    def on_success(self) -> None:
+        with self._lock:
+            self._successes += 1
+            if self._successes >= self.SUCCESS_STREAK and self.rate < self.max_rate:
+                self._successes = 0
+                self.rate = min(self.max_rate, self.rate + self.max_rate / 10)
+
+
 @retry(
     stop=stop_after_attempt(settings.MAX_RETRIES),
     wait=wait_exponential(multiplier=2, min=settings.RETRY_MIN_WAIT, max=settings.RETRY_MAX_WAIT),
     retry=retry_if_exception(_is_retriable),
     before_sleep=before_sleep_log(logger, logging.WARNING),
 )
-def compute_embeddings(provider: LLMProvider, texts: list[str]) -> list[list[float]]:
-    return provider.embed(texts, task_type="document")
+def compute_embeddings(
+    provider: LLMProvider, texts: list[str], bucket: TokenBucket | None = None
+) -> list[list[float]]:
+    if bucket is None:
+        return provider.embed(texts, task_type="document")
+
+    bucket.acquire(sum(map(estimate_tokens, texts)))
+    try:
+        embeddings = provider.embed(texts, task_type="document")
+    except Exception as e:
+        if _is_rate_limited(e):
+            bucket.on_rate_limited()
+        raise
+    bucket.on_success()
+    return embeddings
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count used for batching and pacing (about 4 characters per token)."""
+    return len(text) // 4 + 1
+
+
+def pack_batches(
+    articles: list[TrafficLawArticle], max_tokens: int, max_items: int
+) -> list[list[TrafficLawArticle]]:
+    """Greedily group articles into batches under both an item and a token cap.
+
+    An article larger than max_tokens on its own still gets a batch of one.
+    """
+    batches = []
+    batch: list[TrafficLawArticle] = []
+    tokens = 0
+    for article in articles:
+        cost = estimate_tokens(article.blob_for_embedding)
+        if batch and (len(batch) >= max_items or tokens + cost > max_tokens):
+            batches.append(batch)
+            batch, tokens = [], 0
+        batch.append(article)
+        tokens += cost
+    if batch:
+        batches.append(batch)
+    return batches
+
+
+def embed_batches(
+    provider: LLMProvider,
+    batches: Iterable[list[TrafficLawArticle]],
+    concurrency: int,
+    bucket: TokenBucket | None = None,
+) -> Iterator[tuple[list[TrafficLawArticle], list[list[float]]]]:
+    """Embed batches with up to `concurrency` requests in flight, yielding in input order."""
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        window = deque()
+        for batch in batches:
+            texts = [a.blob_for_embedding for a in batch]
+            window.append((batch, pool.submit(compute_embeddings, provider, texts, bucket)))
+            if len(window) >= concurrency:
+                done, future = window.popleft()
+                yield done, future.result()
+        while window:
+            done, future = window.popleft()
+            yield done, future.result()
 
 
 def load_validated_data() -> list[TrafficLawArticle]:
     if not settings.PROCESSED_FILE.exists():
         raise FileNotFoundError(f"Source file not found: {settings.PROCESSED_FILE}")
 
-    with open(settings.PROCESSED_FILE, "r", encoding="utf-8") as f:
-        raw_data = json.load(f)
+    return ARTICLE_LIST_ADAPTER.validate_json(settings.PROCESSED_FILE.read_bytes())
+
 
-    return [TrafficLawArticle(**item) for item in raw_data]
+def to_vectors(articles: list[TrafficLawArticle], embeddings: list[list[float]]) -> list[tuple]:
+    """Pinecone upsert tuples: id, embedding and the metadata shown with each source."""
+    return [
+        (
+            a.id,
+            emb,
+            {
+                "article_id": a.id,
+                "num": a.article_number,
+                "category": a.context,
+                "content": a.content,
+                "url": a.full_url,
+            },
+        )
+        for a, emb in zip(articles, embeddings)
+    ]
 
 
 def get_or_create_index(pc: Pinecone) -> object:
@@ -59,25 +193,23 @@ def get_or_create_index(pc: Pinecone) -> object:
         while not pc.describe_index(settings.PINECONE_INDEX_NAME).status.get("ready"):
             time.sleep(2)
 
-    return pc.Index(settings.PINECONE_INDEX_NAME)
+    return get_pinecone_index(settings.PINECONE_INDEX_NAME)
 
 
 def main():
     logger.info("Starting indexing pipeline...")
 
     provider = get_provider()
-    pc = Pinecone(api_key=settings.PINECONE_API_KEY)
-    index = get_or_create_index(pc)
+    index = get_or_create_index(get_pinecone_client())
 
     articles = load_validated_data()
     logger.info(f"Loaded {len(articles)} articles.")
 
-    current_ids = {a.id for a in articles}
+    current_ids = frozenset(a.id for a in articles)
 
+    # One paginated listing up front; every batch is then filtered in memory.
     logger.info("Fetching existing IDs from Pinecone...")
-    pinecone_ids = set()
-    for ids_batch in index.list():
-        pinecone_ids.update(ids_batch)
+    pinecone_ids = frozenset(chain.from_iterable(index.list()))
 
     new_articles = [a for a in articles if a.id not in pinecone_ids]
     deleted_ids = list(pinecone_ids - current_ids)
@@ -96,29 +228,28 @@ def main():
 
     total_new = 0
 
-    for i in tqdm(range(0, len(new_articles), settings.BATCH_SIZE), desc="Indexing"):
-        batch = new_articles[i : i + settings.BATCH_SIZE]
-
-        embeddings = compute_embeddings(provider, [a.blob_for_embedding for a in batch])
-
-        vectors = [
-            (
-                a.id,
-                emb,
-                {
-                    "article_id": a.id,
-                    "num": a.article_number,
-                    "category": a.context,
-                    "content": a.content,
-                    "url": a.full_url,
-                },
+    batches = pack_batches(new_articles, settings.EMBEDDING_BATCH_MAX_TOKENS, settings.BATCH_SIZE)
+    bucket = TokenBucket(settings.EMBEDDING_TOKENS_PER_MINUTE)
+    embedded = embed_batches(provider, batches, max(1, settings.EMBEDDING_CONCURRENCY), bucket)
+
+    # Upserts run on a worker thread so batch N is written while later batches are embedded.
+    with ThreadPoolExecutor(max_workers=1) as upserter:
+        pending = None
+        for batch, embeddings in tqdm(embedded, total=len(batches), desc="Indexing"):
+            vectors = to_vectors(batch, embeddings)
+
+            if pending is not None:
+                pending.result()
+            pending = upserter.submit(
+                index.upsert,
+                vectors=vectors,
+                batch_size=settings.UPSERT_BATCH_SIZE,
+                show_progress=False,
             )
-            for a, emb in zip(batch, embeddings)
-        ]
+            total_new += len(batch)
 
-        index.upsert(vectors=vectors)
-        total_new += len(batch)
-        time.sleep(settings.SLEEP_BETWEEN_BATCHES)
+        if pending is not None:
+            pending.result()
 
     stats = index.describe_index_stats()
     logger.info(f"Done. Indexed {total_new} new documents. Total: {stats.total_vector_count}")
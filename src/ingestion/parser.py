@@ -1,16 +1,21 @@
 import os
-import json
 import logging
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import batched, chain, islice
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from lxml import etree
 
 from src.config import settings
-from src.models import TrafficLawArticle
+from src.models import ARTICLE_LIST_ADAPTER, TrafficLawArticle
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
 logger = logging.getLogger(__name__)
 
+# Files handed to each worker per round trip; LEGI articles are only a few KB.
+PARSE_CHUNKSIZE = 64
+
 
 def clean_text(text_list: list[str]) -> str:
     if not text_list:
@@ -18,29 +23,83 @@ def clean_text(text_list: list[str]) -> str:
     return " ".join(" ".join(text_list).split())
 
 
-def parse_xml_file(filepath: Path) -> Optional[TrafficLawArticle]:
+# Elements read from each article, keyed by the parent tag they must sit under
+# (None: anywhere). Only the first match in document order is used.
+_FIELDS = {
+    "ETAT": "META_ARTICLE",
+    "ID": "META_COMMUN",
+    "NUM": "META_ARTICLE",
+    "BLOC_TEXTUEL": None,
+    "CONTENU": None,
+    "CONTEXTE": None,
+}
+
+
+def _find_fields(root: etree._Element) -> dict[str, etree._Element]:
+    """Locate every field in a single walk instead of one descent per lookup.
+
+    Stops as soon as ETAT shows the article is not in force.
+    """
+    found = {}
+    for elem in root.iter(*_FIELDS):
+        tag = elem.tag
+        if tag in found:
+            continue
+        parent_tag = _FIELDS[tag]
+        if parent_tag is not None and elem.getparent().tag != parent_tag:
+            continue
+        found[tag] = elem
+        if tag == "ETAT" and elem.text != "VIGUEUR":
+            break
+        if len(found) == len(_FIELDS):
+            break
+    return found
+
+
+# ETAT sits in the META block at the top of every LEGI article; most of the dump
+# is historical versions that can be rejected from these bytes without lxml.
+_PRESCAN_BYTES = 4096
+_ETAT_TAG = b"<ETAT>"
+_ETAT_VIGUEUR = b"<ETAT>VIGUEUR</ETAT>"
+
+
+def _maybe_in_force(head: bytes) -> bool:
+    """False only when the first ETAT in `head` is visibly not VIGUEUR."""
+    pos = head.find(_ETAT_TAG)
+    if pos == -1 or head.find(b"<", pos + len(_ETAT_TAG)) == -1:
+        # No (complete) ETAT in the prefix: let the full parse decide.
+        return True
+    return head.startswith(_ETAT_VIGUEUR, pos)
+
+
+def parse_xml_file(filepath: str | Path) -> Optional[TrafficLawArticle]:
     try:
-        tree = etree.parse(str(filepath))
-        root = tree.getroot()
+        with open(filepath, "rb") as f:
+            data = f.read()
+        if not _maybe_in_force(data[:_PRESCAN_BYTES]):
+            return None
 
-        if root.findtext(".//META_ARTICLE/ETAT") != "VIGUEUR":
+        fields = _find_fields(etree.fromstring(data))
+
+        etat = fields.get("ETAT")
+        if etat is None or etat.text != "VIGUEUR":
             return None
 
-        article_id = root.findtext(".//META_COMMUN/ID")
-        num = root.findtext(".//META_ARTICLE/NUM")
+        article_id = (fields["ID"].text or "") if "ID" in fields else None
+        num = (fields["NUM"].text or "") if "NUM" in fields else None
 
         content_text = ""
-        bloc = root.find(".//BLOC_TEXTUEL")
+        bloc = fields.get("BLOC_TEXTUEL")
         if bloc is not None:
             content_text = clean_text(list(bloc.itertext()))
 
         if not content_text:
-            contenu = root.find(".//CONTENU")
+            contenu = fields.get("CONTENU")
             if contenu is not None:
                 content_text = clean_text(list(contenu.itertext()))
 
         parents = []
-        ctx = root.find(".//CONTEXTE")
+        ctx = fields.get("CONTEXTE")
         if ctx is not None:
             parents = [t.strip() for t in ctx.itertext() if t.strip()]
 
@@ -58,22 +117,71 @@ def parse_xml_file(filepath: Path) -> Optional[TrafficLawArticle]:
     except ValueError:
         return None
     except Exception as e:
-        logger.error(f"Error parsing {filepath.name}: {e}")
+        logger.error(f"Error parsing {os.path.basename(filepath)}: {e}")
         return None
 
 
-def process_directory(source_dir: Path) -> list[TrafficLawArticle]:
-    articles = []
+def _iter_xml(root: str) -> Iterator[str]:
+    """Yield the path of every .xml file below `root`.
+
+    os.scandir entries carry their file type, so no extra stat or Path object
+    is needed per file.
+    """
+    stack = [root]
+    while stack:
+        subdirs = []
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    subdirs.append(entry.path)
+                elif entry.name.endswith(".xml"):
+                    yield entry.path
+        # Reversed so subdirectories are visited in listing order, as os.walk does.
+        stack.extend(reversed(subdirs))
+
+
+def _parse_batch(paths: tuple[str, ...]) -> list[TrafficLawArticle]:
+    """Parse a batch of files in a worker process (one round-trip per batch)."""
+    return [article for article in map(parse_xml_file, paths) if article is not None]
+
+
+def iter_articles(source_dir: Path, max_workers: Optional[int] = None) -> Iterator[TrafficLawArticle]:
+    """Yield the in-force articles under `source_dir` as they are parsed, in walk order.
+
+    Work is spread over CPU cores: max_workers defaults to os.cpu_count();
+    pass 1 to parse in-process. Files go out PARSE_CHUNKSIZE at a time with at
+    most two batches per worker in flight, so memory stays bounded on large
+    trees, and closing the generator early cancels the batches not yet started.
+    """
     if not source_dir.exists():
-        return []
+        return
 
-    for root, _, files in os.walk(source_dir):
-        for filename in files:
-            if filename.endswith(".xml"):
-                article = parse_xml_file(Path(root) / filename)
-                if article:
-                    articles.append(article)
+    paths = _iter_xml(str(source_dir))
+    head = list(islice(paths, PARSE_CHUNKSIZE + 1))
+    paths = chain(head, paths)
 
+    if max_workers == 1 or len(head) <= PARSE_CHUNKSIZE:
+        yield from filter(None, map(parse_xml_file, paths))
+        return
+
+    workers = max_workers or os.cpu_count() or 1
+    batches = batched(paths, PARSE_CHUNKSIZE)
+    executor = ProcessPoolExecutor(max_workers=workers)
+    pending = deque(executor.submit(_parse_batch, batch) for batch in islice(batches, 2 * workers))
+    try:
+        while pending:
+            articles = pending.popleft().result()
+            batch = next(batches, None)
+            if batch is not None:
+                pending.append(executor.submit(_parse_batch, batch))
+            yield from articles
+    finally:
+        executor.shutdown(wait=not pending, cancel_futures=True)
+
+
+def process_directory(source_dir: Path, max_workers: Optional[int] = None) -> list[TrafficLawArticle]:
+    """All articles from iter_articles() as a list."""
+    articles = list(iter_articles(source_dir, max_workers=max_workers))
     logger.info(f"Parsed {len(articles)} valid articles.")
     return articles
 
@@ -86,8 +194,8 @@ def main():
     output = settings.PROCESSED_FILE
     output.parent.mkdir(parents=True, exist_ok=True)
 
-    with open(output, "w", encoding="utf-8") as f:
-        json.dump([a.model_dump() for a in articles], f, ensure_ascii=False, indent=2)
+    # pydantic-core writes the same bytes as json.dump(ensure_ascii=False, indent=2).
+    output.write_bytes(ARTICLE_LIST_ADAPTER.dump_json(articles, indent=2))
 
     logger.info(f"Saved {len(articles)} articles to {output}")
 
@@ -1,7 +1,15 @@
-from pydantic import BaseModel, field_validator, computed_field
+from dataclasses import dataclass
+from functools import cached_property
+
+from pydantic import BaseModel, ConfigDict, TypeAdapter, field_validator, computed_field
+
+LEGIFRANCE_ARTICLE_URL = "https://www.legifrance.gouv.fr/codes/article_lc/"
 
 
 class TrafficLawArticle(BaseModel):
+    # Articles are never mutated after parsing, which keeps the cached fields valid.
+    model_config = ConfigDict(frozen=True, extra="ignore")
+
     id: str
     article_number: str
     content: str
@@ -14,16 +22,26 @@ class TrafficLawArticle(BaseModel):
             raise ValueError("Article content is empty or too short.")
         return v
 
-    @computed_field
+    # Cached: read for every article on each indexing pass and retry.
+    @computed_field(repr=False)
+    @cached_property
     def blob_for_embedding(self) -> str:
         return f"{self.context}\nArticle {self.article_number} : {self.content}"
 
-    @computed_field
+    @computed_field(repr=False)
+    @cached_property
     def full_url(self) -> str:
-        return f"https://www.legifrance.gouv.fr/codes/article_lc/{self.id}"
+        return LEGIFRANCE_ARTICLE_URL + self.id
+
+
+# Validates or dumps a whole corpus in one pydantic-core call instead of per article.
+ARTICLE_LIST_ADAPTER = TypeAdapter(list[TrafficLawArticle])
 
 
-class RetrievalResult(BaseModel):
+# Built for every search hit from already-validated parts, so a plain slotted
+# dataclass is enough; it skips pydantic validation on the query path.
+@dataclass(slots=True, frozen=True)
+class RetrievalResult:
     article: TrafficLawArticle
     score: float
 
@@ -17,7 +17,8 @@ from tenacity import (
     before_sleep_log,
 )
 
-from src.config import Provider, settings
+from src.clients import get_genai_client
+from src.config import INTENT_VALUES, Provider, settings
 
 logger = logging.getLogger(__name__)
 
@@ -45,6 +46,22 @@ def _query_retry():
     )
 
 
+def _find_intent(text: str) -> str | None:
+    """First intent value appearing in `text`, if any.
+
+    Only sound for output constrained to the intent schema (Gemini's
+    response_schema): free-form JSON may mention other values before the
+    "intent" key.
+    """
+    found = None
+    position = len(text)
+    for value in INTENT_VALUES:
+        index = text.find(value)
+        if 0 <= index < position:
+            found, position = value, index
+    return found
+
+
 class LLMProvider(ABC):
     """Unified interface for LLM + embedding providers."""
 
@@ -60,14 +77,66 @@ class LLMProvider(ABC):
     def classify_intent(self, query: str, system: str) -> dict:
         """Return a structured JSON dict from the classifier model."""
 
+    def warmup(self) -> None:
+        """Open connections ahead of the first query. Optional, best effort."""
+
 
 class GeminiProvider(LLMProvider):
 
     def __init__(self):
-        from google import genai
         from google.genai import types
         self._types = types
-        self.client = genai.Client(api_key=settings.GOOGLE_API_KEY)
+        self.client = get_genai_client()
+        self._generation_configs: dict[tuple, object] = {}
+        self._classifier_configs: dict[str, object] = {}
+
+    def _generation_config(self, system: str, temperature: float, max_tokens: int):
+        """Build each distinct GenerateContentConfig once instead of on every call."""
+        key = (system, temperature, max_tokens)
+        config = self._generation_configs.get(key)
+        if config is None:
+            config = self._types.GenerateContentConfig(
+                system_instruction=system,
+                temperature=temperature,
+                max_output_tokens=max_tokens,
+                thinking_config=self._types.ThinkingConfig(thinking_budget=0),
+            )
+            self._generation_configs[key] = config
+        return config
+
+    def _classifier_config(self, system: str):
+        """Structured-output config for classify_intent, built once per system prompt."""
+        config = self._classifier_configs.get(system)
+        if config is None:
+            from src.classifier import INTENT_SCHEMA
+
+            config = self._types.GenerateContentConfig(
+                system_instruction=system,
+                temperature=0.0,
+                max_output_tokens=50,
+                response_mime_type="application/json",
+                response_schema=INTENT_SCHEMA,
+                thinking_config=self._types.ThinkingConfig(thinking_budget=0),
+                automatic_function_calling=self._types.AutomaticFunctionCallingConfig(
+                    disable=True
+                ),
+            )
+            self._classifier_configs[system] = config
+        return config
+
+    def warmup(self):
+        """One-token request so TCP + TLS to the Gemini endpoint are already up."""
+        try:
+            self.client.models.generate_content(
+                model=settings.CLASSIFIER_MODEL,
+                contents="ping",
+                config=self._types.GenerateContentConfig(
+                    max_output_tokens=1,
+                    thinking_config=self._types.ThinkingConfig(thinking_budget=0),
+                ),
+            )
+        except Exception as e:
+            logger.warning("Gemini warmup failed: %s", e)
 
     @_query_retry()
     def embed(self, texts, task_type="document"):
@@ -82,25 +151,28 @@ class GeminiProvider(LLMProvider):
     def generate_stream(self, prompt, system, **kwargs):
         """Stream a completion with manual retry (tenacity doesn't support generators)."""
         last_exc = None
+        yielded = False
+        config = self._generation_config(
+            system,
+            kwargs.get("temperature", settings.GENERATION_TEMPERATURE),
+            kwargs.get("max_tokens", settings.GENERATION_MAX_TOKENS),
+        )
         for attempt in range(settings.QUERY_MAX_RETRIES):
             try:
                 response = self.client.models.generate_content_stream(
                     model=settings.GENERATION_MODEL,
                     contents=prompt,
-                    config=self._types.GenerateContentConfig(
-                        system_instruction=system,
-                        temperature=kwargs.get("temperature", settings.GENERATION_TEMPERATURE),
-                        max_output_tokens=kwargs.get("max_tokens", settings.GENERATION_MAX_TOKENS),
-                        thinking_config=self._types.ThinkingConfig(thinking_budget=0),
-                    ),
+                    config=config,
                 )
                 for chunk in response:
                     if chunk.text:
+                        yielded = True
                         yield chunk.text
                 return
             except Exception as e:
                 last_exc = e
-                if not _is_query_retriable(e):
+                # A restart would replay text the caller already has.
+                if yielded or not _is_query_retriable(e):
                     raise
                 wait = min(settings.QUERY_RETRY_MIN_WAIT * (2 ** attempt), settings.QUERY_RETRY_MAX_WAIT)
                 logger.warning("generate_stream attempt %d/%d failed: %s. Retrying in %.1fs",
@@ -110,24 +182,24 @@ class GeminiProvider(LLMProvider):
 
     @_query_retry()
     def classify_intent(self, query, system):
-        from src.classifier import INTENT_SCHEMA
+        """Stream the structured answer and return as soon as an intent value appears.
 
-        response = self.client.models.generate_content(
+        With a single-enum schema the value is decoded within the first tokens,
+        so waiting for the closing brace only adds decode latency.
+        """
+        stream = self.client.models.generate_content_stream(
             model=settings.CLASSIFIER_MODEL,
             contents=f"Message utilisateur : {query}",
-            config=self._types.GenerateContentConfig(
-                system_instruction=system,
-                temperature=0.0,
-                max_output_tokens=50,
-                response_mime_type="application/json",
-                response_schema=INTENT_SCHEMA,
-                thinking_config=self._types.ThinkingConfig(thinking_budget=0),
-                automatic_function_calling=self._types.AutomaticFunctionCallingConfig(
-                    disable=True
-                ),
-            ),
+            config=self._classifier_config(system),
         )
-        return json.loads(response.text)
+        parts = []
+        for chunk in stream:
+            if chunk.text:
+                parts.append(chunk.text)
+                value = _find_intent("".join(parts))
+                if value is not None:
+                    return {"intent": value}
+        return json.loads("".join(parts))
 
 
 class OllamaProvider(LLMProvider):
@@ -157,6 +229,7 @@ class OllamaProvider(LLMProvider):
 
     def generate_stream(self, prompt, system, **kwargs):
         last_exc = None
+        yielded = False
         options = {
             "temperature": kwargs.get("temperature", settings.GENERATION_TEMPERATURE),
             "num_predict": kwargs.get("max_tokens", settings.GENERATION_MAX_TOKENS),
@@ -175,11 +248,13 @@ class OllamaProvider(LLMProvider):
                 for chunk in stream:
                     piece = chunk.get("message", {}).get("content")
                     if piece:
+                        yielded = True
                         yield piece
                 return
             except Exception as e:
                 last_exc = e
-                if not _is_query_retriable(e):
+                # A restart would replay text the caller already has.
+                if yielded or not _is_query_retriable(e):
                     raise
                 wait = min(settings.QUERY_RETRY_MIN_WAIT * (2 ** attempt), settings.QUERY_RETRY_MAX_WAIT)
                 logger.warning("ollama generate_stream attempt %d/%d failed: %s. Retrying in %.1fs",
@@ -239,8 +314,13 @@ class GroqProvider(LLMProvider):
     def embed(self, texts, task_type="document"):
         return self._fallback.embed(texts, task_type=task_type)
 
+    def warmup(self):
+        # Embeddings always go through Gemini, so that connection matters most.
+        self._fallback.warmup()
+
     def generate_stream(self, prompt, system, **kwargs):
         last_exc = None
+        yielded = False
         for attempt in range(settings.QUERY_MAX_RETRIES):
             try:
                 stream = self._client.chat.completions.create(
@@ -256,10 +336,14 @@ class GroqProvider(LLMProvider):
                 for chunk in stream:
                     piece = chunk.choices[0].delta.content
                     if piece:
+                        yielded = True
                         yield piece
                 return
             except Exception as e:
                 last_exc = e
+                # A restart (or fallback) would replay text the caller already has.
+                if yielded:
+                    raise
                 if self._is_groq_quota_error(e):
                     logger.warning("Groq quota exceeded, falling back to Gemini: %s", e)
                     yield from self._fallback.generate_stream(prompt, system, **kwargs)
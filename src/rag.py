@@ -68,6 +68,31 @@ class RAG:
         self.retriever = TrafficRetriever(self.provider)
         self.generator = TrafficGenerator(self.provider)
 
+    def warmup(self) -> None:
+        """Readiness barrier: connections and anchor embeddings are ready once this returns."""
+        self.provider.warmup()
+        self.classifier.warmup()
+        self.retriever.warmup()
+
+    def classify(self, question: str, vector: list[float] | None = None, embed: bool = True) -> Intent:
+        """Route via the local embedding router, falling back to the LLM classifier.
+
+        Greetings and previously classified questions are answered before any
+        embedding is made. Otherwise the question is embedded for the router,
+        unless `vector` is supplied or `embed` is False (e.g. a prefetch already
+        failed). The embedding is memoized by the retriever, so a search on the
+        same (unrewritten) question reuses it instead of embedding it again.
+        """
+        intent = self.classifier.classify_fast(question)
+        if intent is not None:
+            return intent
+        if vector is None and embed and settings.INTENT_ROUTER_ENABLED:
+            try:
+                vector = self.retriever.embed_query(question)
+            except Exception as e:
+                logger.warning("Query embedding for intent routing failed: %s", e)
+        return self.classifier.classify(question, vector=vector)
+
     def rewrite_query(self, question: str, history: list[dict]) -> str:
         """Reformulate a follow-up question into a standalone search query."""
         if not history:
@@ -84,13 +109,12 @@ class RAG:
         if intent != Intent.LEGAL_QUERY:
             return []
         search_query = self.rewrite_query(question, history or [])
-        results = self.retriever.search(search_query, k=k)
-        return [r for r in results if r.score > settings.RELEVANCE_THRESHOLD]
+        return self.retriever.search(search_query, k=k, min_score=settings.RELEVANCE_THRESHOLD)
 
     def query(self, question: str, k: int = 5, history: list[dict] | None = None) -> RAGResponse:
         """Full RAG pipeline: classify -> retrieve -> generate."""
         try:
-            intent = self.classifier.classify(question)
+            intent = self.classify(question)
         except Exception as e:
             logger.error("Classification failed (retries exhausted): %s", e)
             intent = Intent.LEGAL_QUERY
@@ -126,7 +150,7 @@ class RAG:
     def stream(self, question: str, k: int = 5, history: list[dict] | None = None) -> Iterator[str]:
         """Streaming variant with graceful degradation."""
         try:
-            intent = self.classifier.classify(question)
+            intent = self.classify(question)
         except Exception as e:
             logger.error("Classification failed (retries exhausted): %s", e)
             intent = Intent.LEGAL_QUERY
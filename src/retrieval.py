@@ -1,6 +1,7 @@
 import logging
-from pinecone import Pinecone
 
+from src.cache import LRUCache, normalize_query
+from src.clients import get_pinecone_index
 from src.config import settings
 from src.models import RetrievalResult, TrafficLawArticle
 from src.providers import LLMProvider
@@ -12,18 +13,40 @@ class TrafficRetriever:
 
     def __init__(self, provider: LLMProvider):
         self.provider = provider
-        pc = Pinecone(api_key=settings.PINECONE_API_KEY)
-        self.index = pc.Index(settings.PINECONE_INDEX_NAME)
+        self.index = get_pinecone_index(settings.PINECONE_INDEX_NAME)
+        self._cache = LRUCache(settings.QUERY_CACHE_SIZE, ttl=settings.QUERY_CACHE_TTL)
+        self._embeddings = LRUCache(settings.QUERY_CACHE_SIZE, ttl=settings.QUERY_CACHE_TTL)
 
-    def search(self, query: str, k: int = None) -> list[RetrievalResult]:
+    def warmup(self) -> None:
+        """Open the Pinecone connection ahead of the first query. Best effort."""
+        try:
+            self.index.describe_index_stats()
+        except Exception as e:
+            logger.warning(f"Pinecone warmup failed: {e}")
+
+    def embed_query(self, query: str) -> list[float]:
+        """Query embedding, memoized so intent routing and search share one API call."""
+        # The cache belongs to this retriever, hence to one provider and its embedding model.
+        key = normalize_query(query)
+        vector = self._embeddings.get(key)
+        if vector is None:
+            vector = self.provider.embed([query], task_type="query")[0]
+            self._embeddings.put(key, vector)
+        return vector
+
+    def search(self, query: str, k: int = None, min_score: float | None = None) -> list[RetrievalResult]:
         k = k or settings.DEFAULT_TOP_K
 
         if not query or len(query.strip()) < 3:
             return []
 
+        key = (normalize_query(query), k, min_score)
+        cached = self._cache.get(key)
+        if cached is not None:
+            return list(cached)
+
         try:
-            vectors = self.provider.embed([query], task_type="query")
-            query_vector = vectors[0]
+            query_vector = self.embed_query(query)
         except Exception as e:
             logger.error(f"Embedding failed: {e}")
             return []
@@ -38,9 +61,14 @@ class TrafficRetriever:
             logger.error(f"Pinecone query failed: {e}")
             return []
 
-        return self._parse_matches(results.matches)
+        parsed = self._parse_matches(results.matches, min_score)
+        if parsed:
+            self._cache.put(key, parsed)
+        return list(parsed)
 
-    def search_by_vector(self, vector: list[float], k: int = None) -> list[RetrievalResult]:
+    def search_by_vector(
+        self, vector: list[float], k: int = None, min_score: float | None = None
+    ) -> list[RetrievalResult]:
         """Query Pinecone with a pre-computed embedding vector."""
         k = k or settings.DEFAULT_TOP_K
         try:
@@ -52,11 +80,18 @@ class TrafficRetriever:
         except Exception as e:
             logger.error(f"Pinecone query failed: {e}")
             return []
-        return self._parse_matches(results.matches)
+        return self._parse_matches(results.matches, min_score)
+
+    def _parse_matches(self, matches, min_score: float | None = None) -> list[RetrievalResult]:
+        """Rehydrate matches, keeping only scores strictly above min_score (if given).
 
-    def _parse_matches(self, matches) -> list[RetrievalResult]:
+        Pinecone returns matches by descending score, so the first one at or
+        below the threshold ends the scan and nothing below it is rebuilt.
+        """
         clean_results = []
         for match in matches:
+            if min_score is not None and match.score <= min_score:
+                break
             try:
                 meta = match.metadata
                 article = TrafficLawArticle(
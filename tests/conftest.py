@@ -1,5 +1,31 @@
 import sys
 from pathlib import Path
 
+import pytest
+
 PROJECT_ROOT = Path(__file__).resolve().parent.parent
 sys.path.insert(0, str(PROJECT_ROOT))
+
+from src.models import TrafficLawArticle  # noqa: E402
+
+
+# --- Shared fixtures ---
+
+SAMPLE_ARTICLE_DATA = {
+    "id": "LEGIARTI000006841575",
+    "article_number": "R413-17",
+    "content": "Sur les autoroutes, la vitesse des véhicules est limitée à 130 km/h.",
+    "context": "Code de la route > Partie réglementaire > Livre IV > Titre I",
+}
+
+
+@pytest.fixture
+def sample_article_data():
+    """Minimal valid article data. A fresh copy per test, so tests may edit it."""
+    return dict(SAMPLE_ARTICLE_DATA)
+
+
+@pytest.fixture(scope="module")
+def sample_article():
+    """Articles are frozen, so one instance is safely shared by a whole module."""
+    return TrafficLawArticle(**SAMPLE_ARTICLE_DATA)
@@ -1,5 +1,6 @@
 """Integration tests for the FastAPI chat endpoint (SSE)."""
 
+import threading
 from unittest.mock import MagicMock
 
 import pytest
@@ -7,6 +8,7 @@ from fastapi.testclient import TestClient
 
 from src.api.deps import get_rag
 from src.api.main import app
+from src.api.sse import sse
 from src.classifier import Intent
 from src.models import RetrievalResult, TrafficLawArticle
 
@@ -22,7 +24,8 @@ def _fake_article(number: str = "R412-6-1") -> TrafficLawArticle:
 
 def _make_rag(intent: Intent, sources: list[RetrievalResult], tokens: list[str]) -> MagicMock:
     rag = MagicMock()
-    rag.classifier.classify.return_value = intent
+    rag.classifier.classify_fast.return_value = None
+    rag.classify.return_value = intent
     rag.rewrite_query.return_value = "rewritten"
     rag.retriever.search.return_value = sources
     rag.generator.generate_stream.return_value = iter(tokens)
@@ -104,7 +107,8 @@ def test_chat_chitchat_skips_retrieval_but_generates(client):
 
 def test_chat_retrieval_failure_returns_unavailable_message(client):
     rag = MagicMock()
-    rag.classifier.classify.return_value = Intent.LEGAL_QUERY
+    rag.classifier.classify_fast.return_value = None
+    rag.classify.return_value = Intent.LEGAL_QUERY
     rag.rewrite_query.return_value = "x"
     rag.retriever.search_by_vector.side_effect = RuntimeError("pinecone down")
     app.dependency_overrides[get_rag] = lambda: rag
@@ -118,6 +122,60 @@ def test_chat_retrieval_failure_returns_unavailable_message(client):
     rag.generator.generate_stream.assert_not_called()
 
 
+def test_chat_fast_path_starts_no_rewrite_or_embedding(client, monkeypatch):
+    monkeypatch.setattr("src.api.routes.chat.settings.INTENT_ROUTER_ENABLED", True)
+    rag = _make_rag(Intent.CHITCHAT, [], ["Bonjour !"])
+    rag.classifier.classify_fast.return_value = Intent.CHITCHAT
+    app.dependency_overrides[get_rag] = lambda: rag
+
+    response = client.post("/api/chat", json={"prompt": "Bonjour !"})
+    events = _parse_sse(response.text)
+    assert events[0] == ("intent", '{"intent":"CHITCHAT"}')
+    rag.classify.assert_not_called()
+    rag.retriever.embed_query.assert_not_called()
+    rag.rewrite_query.assert_not_called()
+
+
+def test_chat_follow_up_embeds_only_the_rewrite_when_router_is_off(client):
+    rag = _make_rag(Intent.LEGAL_QUERY, [], ["Réponse."])
+    rag.retriever.search_by_vector.return_value = []
+    app.dependency_overrides[get_rag] = lambda: rag
+
+    history = [{"role": "user", "content": "Vitesse sur autoroute ?"}, {"role": "assistant", "content": "130 km/h."}]
+    client.post("/api/chat", json={"prompt": "Et sur route ?", "history": history})
+    rag.retriever.embed_query.assert_called_once_with("rewritten")
+
+
+def test_chat_failed_prefetch_is_not_retried_for_routing(client, monkeypatch):
+    monkeypatch.setattr("src.api.routes.chat.settings.INTENT_ROUTER_ENABLED", True)
+    rag = _make_rag(Intent.CHITCHAT, [], ["Salut"])
+    rag.retriever.embed_query.side_effect = RuntimeError("embedding down")
+    app.dependency_overrides[get_rag] = lambda: rag
+
+    client.post("/api/chat", json={"prompt": "Tu es qui ?"})
+    rag.classify.assert_called_once_with("Tu es qui ?", vector=None, embed=False)
+
+
+def test_get_rag_builds_one_instance_under_concurrency(monkeypatch):
+    import time
+    from src.api import deps
+
+    def slow_rag():
+        time.sleep(0.05)
+        return MagicMock()
+
+    monkeypatch.setattr(deps, "_rag", None)
+    monkeypatch.setattr(deps, "RAG", MagicMock(side_effect=slow_rag))
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(deps.get_rag())) for _ in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(results) == 4 and all(r is results[0] for r in results)
+    deps.RAG.assert_called_once()
+
+
 def test_chat_rejects_empty_prompt(client):
     rag = _make_rag(Intent.LEGAL_QUERY, [], [])
     app.dependency_overrides[get_rag] = lambda: rag
@@ -132,3 +190,8 @@ def test_health_endpoint(client):
     body = response.json()
     assert body["status"] == "ok"
     assert "version" in body
+
+
+def test_sse_payload_is_single_line_json_with_accents():
+    message = sse("token", {"text": "Vitesse limitée\nà 130 km/h"})
+    assert message == 'event: token\ndata: {"text":"Vitesse limitée\\nà 130 km/h"}\n\n'
@@ -0,0 +1,60 @@
+"""
+Tests for the query-time cache helpers (cache.py).
+"""
+
+import pytest
+
+from src.cache import LRUCache, normalize_query
+
+
+class TestNormalizeQuery:
+
+    def test_ignores_case_and_spacing(self):
+        assert normalize_query("  Vitesse   SUR autoroute ? ") == "vitesse sur autoroute ?"
+
+    def test_applies_unicode_normalization(self):
+        """NFKC folds compatibility characters (e.g. ligatures, non-breaking spaces)."""
+        assert normalize_query("e\ufb00et\u00a0immédiat") == "effet immédiat"
+
+
+class TestLRUCache:
+
+    def test_returns_default_on_miss(self):
+        cache = LRUCache(maxsize=2)
+        assert cache.get("missing") is None
+        assert cache.get("missing", "fallback") == "fallback"
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+        assert cache.get("c") == 3
+
+    def test_zero_size_disables_cache(self):
+        cache = LRUCache(maxsize=0)
+        cache.put("a", 1)
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_entries_expire_after_ttl(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("src.cache.time.monotonic", lambda: now[0])
+        cache = LRUCache(maxsize=2, ttl=10)
+        cache.put("a", 1)
+        now[0] += 9
+        assert cache.get("a") == 1
+        now[0] += 2
+        assert cache.get("a") is None
+        assert len(cache) == 0
+
+    def test_no_ttl_never_expires(self, monkeypatch):
+        now = [100.0]
+        monkeypatch.setattr("src.cache.time.monotonic", lambda: now[0])
+        cache = LRUCache(maxsize=2)
+        cache.put("a", 1)
+        now[0] += 1e9
+        assert cache.get("a") == 1
@@ -11,8 +11,9 @@ import json
 import pytest
 from unittest.mock import MagicMock
 
+from src.config import INTENT_VALUES
 from src.providers import LLMProvider
-from src.classifier import IntentClassifier, Intent, CLASSIFICATION_PROMPT, INTENT_SCHEMA
+from src.classifier import IntentClassifier, Intent, CLASSIFICATION_PROMPT, INTENT_SCHEMA, INTENT_ANCHORS
 
 
 # --- Fixtures ---
@@ -32,6 +33,17 @@ def _set_intent(provider, intent_value: str):
     provider.classify_intent.return_value = {"intent": intent_value}
 
 
+# One orthogonal axis per intent: anchors of an intent all embed onto its axis.
+_AXES = {intent: [1.0 if j == i else 0.0 for j in range(3)] for i, intent in enumerate(INTENT_ANCHORS)}
+
+
+def _set_anchor_embeddings(provider):
+    """Helper: makes the mocked provider embed every anchor onto its intent axis."""
+    provider.embed.return_value = [
+        _AXES[intent] for intent, phrases in INTENT_ANCHORS.items() for _ in phrases
+    ]
+
+
 # ============================================================
 # Intent Classification
 # ============================================================
@@ -67,6 +79,160 @@ class TestIntentClassification:
         assert result == Intent.CHITCHAT
 
 
+# ============================================================
+# Greeting Fast Path
+# ============================================================
+
+class TestGreetingFastPath:
+    """Messages made only of greeting keywords skip the provider entirely."""
+
+    @pytest.mark.parametrize("message", ["Bonjour !", "merci beaucoup", "Salut, ça va ?", "OK merci"])
+    def test_greetings_skip_provider(self, mock_provider, mock_classifier, message):
+        assert mock_classifier.classify(message) == Intent.CHITCHAT
+        mock_provider.classify_intent.assert_not_called()
+
+    def test_greeting_with_question_goes_to_provider(self, mock_provider, mock_classifier):
+        _set_intent(mock_provider, "LEGAL_QUERY")
+        result = mock_classifier.classify("Bonjour, peut-on klaxonner ?")
+        assert result == Intent.LEGAL_QUERY
+        mock_provider.classify_intent.assert_called_once()
+
+    def test_keyword_inside_word_goes_to_provider(self, mock_provider, mock_classifier):
+        _set_intent(mock_provider, "OFF_TOPIC")
+        mock_classifier.classify("Salutations distinguées")
+        mock_provider.classify_intent.assert_called_once()
+
+    def test_run_together_keywords_go_to_provider(self, mock_provider, mock_classifier):
+        _set_intent(mock_provider, "OFF_TOPIC")
+        mock_classifier.classify("okmerci")
+        mock_provider.classify_intent.assert_called_once()
+
+    @pytest.mark.parametrize("message", ["Merci beaucoup, au revoir !", "BONNE JOURNÉE", "ça va ? super"])
+    def test_multi_word_keywords_match(self, mock_provider, mock_classifier, message):
+        assert mock_classifier.classify(message) == Intent.CHITCHAT
+        mock_provider.classify_intent.assert_not_called()
+
+
+# ============================================================
+# Local Embedding Router
+# ============================================================
+
+class TestLocalRouting:
+    """
+    When a query embedding is available, the classifier compares it to
+    pre-embedded anchor phrases and only calls the LLM when unsure.
+    """
+
+    @pytest.fixture(autouse=True)
+    def router_enabled(self, monkeypatch):
+        monkeypatch.setattr("src.classifier.settings.INTENT_ROUTER_ENABLED", True)
+
+    def test_close_vector_routes_without_llm(self, mock_provider, mock_classifier):
+        _set_anchor_embeddings(mock_provider)
+        result = mock_classifier.classify("Tu es un robot ?", vector=_AXES[Intent.CHITCHAT])
+        assert result == Intent.CHITCHAT
+        mock_provider.classify_intent.assert_not_called()
+
+    def test_anchors_embedded_once(self, mock_provider, mock_classifier):
+        _set_anchor_embeddings(mock_provider)
+        mock_classifier.classify("Vitesse autoroute ?", vector=_AXES[Intent.LEGAL_QUERY])
+        mock_classifier.classify("Alcool au volant ?", vector=_AXES[Intent.LEGAL_QUERY])
+        assert mock_provider.embed.call_count == 1
+
+    def test_ambiguous_vector_falls_back_to_llm(self, mock_provider, mock_classifier):
+        _set_anchor_embeddings(mock_provider)
+        _set_intent(mock_provider, "LEGAL_QUERY")
+        result = mock_classifier.classify("Question floue", vector=[1.0, 1.0, 1.0])
+        assert result == Intent.LEGAL_QUERY
+        mock_provider.classify_intent.assert_called_once()
+
+    def test_anchor_embedding_failure_falls_back_to_llm(self, mock_provider, mock_classifier):
+        mock_provider.embed.side_effect = Exception("API timeout")
+        _set_intent(mock_provider, "OFF_TOPIC")
+        result = mock_classifier.classify("Recette de crêpes ?", vector=[0.0, 0.0, 1.0])
+        assert result == Intent.OFF_TOPIC
+
+    def test_warmup_embeds_anchors_once(self, mock_provider, mock_classifier):
+        _set_anchor_embeddings(mock_provider)
+        mock_classifier.warmup()
+        mock_classifier.classify("Tu es un robot ?", vector=_AXES[Intent.CHITCHAT])
+        assert mock_provider.embed.call_count == 1
+
+    def test_warmup_failure_is_swallowed(self, mock_provider, mock_classifier):
+        mock_provider.embed.side_effect = Exception("API timeout")
+        mock_classifier.warmup()
+
+    def test_no_vector_uses_llm(self, mock_provider, mock_classifier):
+        _set_intent(mock_provider, "CHITCHAT")
+        mock_classifier.classify("Tu fais quoi ?")
+        mock_provider.embed.assert_not_called()
+        mock_provider.classify_intent.assert_called_once()
+
+    def test_router_disabled_by_default(self):
+        from src.config import Settings
+
+        assert Settings.model_fields["INTENT_ROUTER_ENABLED"].default is False
+
+
+# ============================================================
+# Cheap Pre-checks
+# ============================================================
+
+class TestFastPath:
+    """classify_fast answers without any API call, or returns None."""
+
+    def test_greeting_and_cache_hit(self, mock_provider, mock_classifier):
+        _set_intent(mock_provider, "OFF_TOPIC")
+        mock_classifier.classify("Recette de crêpes ?")
+        assert mock_classifier.classify_fast("Bonjour !") == Intent.CHITCHAT
+        assert mock_classifier.classify_fast("recette de crêpes ?") == Intent.OFF_TOPIC
+        mock_provider.classify_intent.assert_called_once()
+
+    def test_miss_returns_none(self, mock_provider, mock_classifier):
+        assert mock_classifier.classify_fast("Vitesse sur autoroute ?") is None
+        mock_provider.classify_intent.assert_not_called()
+
+    @pytest.fixture
+    def rag(self, mock_provider, monkeypatch):
+        from unittest.mock import patch
+        from src.rag import RAG
+
+        monkeypatch.setattr("src.rag.settings.INTENT_ROUTER_ENABLED", True)
+        with patch("src.rag.get_provider", return_value=mock_provider), patch("src.rag.TrafficRetriever"):
+            yield RAG()
+
+    def test_rag_skips_embedding_for_greeting(self, rag):
+        assert rag.classify("Bonjour !") == Intent.CHITCHAT
+        rag.retriever.embed_query.assert_not_called()
+
+    def test_rag_does_not_reembed_after_failed_prefetch(self, mock_provider, rag):
+        _set_intent(mock_provider, "LEGAL_QUERY")
+        assert rag.classify("Vitesse sur autoroute ?", embed=False) == Intent.LEGAL_QUERY
+        rag.retriever.embed_query.assert_not_called()
+
+
+# ============================================================
+# Classification Cache
+# ============================================================
+
+class TestClassificationCache:
+    """Repeated (normalized) queries are answered without another provider call."""
+
+    def test_repeated_query_hits_cache(self, mock_provider, mock_classifier):
+        _set_intent(mock_provider, "LEGAL_QUERY")
+        mock_classifier.classify("Vitesse sur autoroute ?")
+        result = mock_classifier.classify("  vitesse SUR autoroute ? ")
+        assert result == Intent.LEGAL_QUERY
+        mock_provider.classify_intent.assert_called_once()
+
+    def test_failures_are_not_cached(self, mock_provider, mock_classifier):
+        mock_provider.classify_intent.side_effect = Exception("API timeout")
+        mock_classifier.classify("Feux de croisement ?")
+        mock_provider.classify_intent.side_effect = None
+        _set_intent(mock_provider, "OFF_TOPIC")
+        assert mock_classifier.classify("Feux de croisement ?") == Intent.OFF_TOPIC
+
+
 # ============================================================
 # Structured Output Parsing
 # ============================================================
@@ -134,9 +300,9 @@ class TestSchemaAndPrompt:
         assert "intent" in INTENT_SCHEMA["properties"]
 
     def test_schema_enum_matches_intent_class(self):
+        """The schema enum is written out by hand; providers scan for INTENT_VALUES."""
         schema_values = set(INTENT_SCHEMA["properties"]["intent"]["enum"])
-        enum_values = {i.value for i in Intent}
-        assert schema_values == enum_values
+        assert schema_values == {i.value for i in Intent} == set(INTENT_VALUES)
 
     def test_schema_intent_is_required(self):
         assert "intent" in INTENT_SCHEMA["required"]
@@ -26,7 +26,7 @@ def generator(mock_provider):
     return TrafficGenerator(mock_provider)
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def sample_results():
     """Two RetrievalResults simulating a real search output."""
     art1 = TrafficLawArticle(
@@ -112,3 +112,90 @@ class TestContextFormatting:
         context = generator._format_context(sample_results[:1])
         assert "SOURCE 1" in context
         assert "SOURCE 2" not in context
+
+
+# ============================================================
+# Stream Coalescing
+# ============================================================
+
+class TestStreamCoalescing:
+    """Token pieces are merged before reaching the UI, without losing text."""
+
+    def test_first_piece_is_not_delayed(self, generator, mock_provider, sample_results):
+        mock_provider.generate_stream.return_value = iter(["Selon", " l'", "article"])
+        chunks = list(generator.generate_stream("Vitesse ?", sample_results))
+        assert chunks[0] == "Selon"
+
+    def test_small_pieces_are_merged(self, generator, mock_provider, sample_results):
+        mock_provider.generate_stream.return_value = iter(["Selon", " l'", "article", " R413-17"])
+        chunks = list(generator.generate_stream("Vitesse ?", sample_results))
+        assert chunks == ["Selon", " l'article R413-17"]
+
+    def test_line_break_flushes(self, generator, mock_provider, sample_results):
+        mock_provider.generate_stream.return_value = iter(["A", "1.\n", "2.", "\n"])
+        chunks = list(generator.generate_stream("Vitesse ?", sample_results))
+        assert chunks == ["A", "1.\n", "2.\n"]
+
+    def test_long_text_flushes_before_end(self, generator, mock_provider, sample_results):
+        pieces = ["x" * 10] * 8
+        mock_provider.generate_stream.return_value = iter(pieces)
+        chunks = list(generator.generate_stream("Vitesse ?", sample_results))
+        assert len(chunks) > 2
+        assert "".join(chunks) == "".join(pieces)
+
+    def test_generate_returns_full_text(self, generator, mock_provider, sample_results):
+        mock_provider.generate_stream.return_value = iter(["La ", "vitesse ", "est ", "limitée."])
+        assert generator.generate("Vitesse ?", sample_results) == "La vitesse est limitée."
+
+
+# ============================================================
+# Answer Cache
+# ============================================================
+
+class TestAnswerCache:
+    """Identical prompts at temperature 0 replay the stored answer."""
+
+    def test_repeated_question_calls_provider_once(self, generator, mock_provider, sample_results):
+        mock_provider.generate_stream.return_value = iter(["La vitesse ", "est limitée."])
+        first = generator.generate("Vitesse ?", sample_results)
+        second = generator.generate("Vitesse ?", sample_results)
+        assert first == second == "La vitesse est limitée."
+        mock_provider.generate_stream.assert_called_once()
+
+    def test_different_sources_miss_cache(self, generator, mock_provider, sample_results):
+        mock_provider.generate_stream.side_effect = lambda *a, **kw: iter(["Réponse."])
+        generator.generate("Vitesse ?", sample_results)
+        generator.generate("Vitesse ?", sample_results[:1])
+        assert mock_provider.generate_stream.call_count == 2
+
+    def test_different_history_misses_cache(self, generator, mock_provider, sample_results):
+        mock_provider.generate_stream.side_effect = lambda *a, **kw: iter(["Réponse."])
+        generator.generate("Et sur route ?", sample_results)
+        generator.generate("Et sur route ?", sample_results, history=[{"role": "user", "content": "Vitesse ?"}])
+        assert mock_provider.generate_stream.call_count == 2
+
+    def test_nonzero_temperature_bypasses_cache(self, generator, mock_provider, sample_results, monkeypatch):
+        monkeypatch.setattr("src.generation.settings.GENERATION_TEMPERATURE", 0.7)
+        mock_provider.generate_stream.side_effect = lambda *a, **kw: iter(["Réponse."])
+        generator.generate("Vitesse ?", sample_results)
+        generator.generate("Vitesse ?", sample_results)
+        assert mock_provider.generate_stream.call_count == 2
+
+    def test_interrupted_stream_is_not_cached(self, generator, mock_provider, sample_results):
+        mock_provider.generate_stream.side_effect = lambda *a, **kw: iter(["Début", " de réponse."])
+        stream = generator.generate_stream("Vitesse ?", sample_results)
+        next(stream)
+        stream.close()
+        generator.generate("Vitesse ?", sample_results)
+        assert mock_provider.generate_stream.call_count == 2
+
+    def test_failed_stream_is_not_cached(self, generator, mock_provider, sample_results):
+        def failing(*args, **kwargs):
+            yield "La vitesse "
+            raise RuntimeError("stream dropped")
+
+        mock_provider.generate_stream.side_effect = failing
+        with pytest.raises(RuntimeError):
+            generator.generate("Vitesse ?", sample_results)
+        mock_provider.generate_stream.side_effect = lambda *a, **kw: iter(["La vitesse est limitée."])
+        assert generator.generate("Vitesse ?", sample_results) == "La vitesse est limitée."
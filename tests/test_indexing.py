@@ -0,0 +1,183 @@
+"""
+Tests for the indexing pipeline helpers (indexing.py).
+
+Strategy: The provider is mocked and no Pinecone index is touched. We verify
+batch ordering, vector assembly and the pieces that pace the embedding API.
+"""
+
+import threading
+import time
+
+import pytest
+from unittest.mock import MagicMock
+
+from src.ingestion.indexing import TokenBucket, embed_batches, estimate_tokens, pack_batches, to_vectors
+from src.models import TrafficLawArticle
+from src.providers import LLMProvider
+
+
+# --- Fixtures ---
+
+def make_article(i: int) -> TrafficLawArticle:
+    return TrafficLawArticle(
+        id=f"LEGIARTI{i:012d}",
+        article_number=f"R{i}",
+        content=f"Contenu de l'article numéro {i}.",
+        context="Code de la route",
+    )
+
+
+@pytest.fixture(scope="module")
+def articles():
+    return [make_article(i) for i in range(10)]
+
+
+@pytest.fixture
+def provider():
+    provider = MagicMock(spec=LLMProvider)
+    provider.embed.side_effect = lambda texts, task_type="document": [[float(len(t))] for t in texts]
+    return provider
+
+
+# ============================================================
+# Batch packing
+# ============================================================
+
+class TestPackBatches:
+    """Batches are filled up to the item cap or the token budget."""
+
+    def test_respects_item_cap(self, articles):
+        batches = pack_batches(articles, max_tokens=10_000, max_items=4)
+        assert [len(b) for b in batches] == [4, 4, 2]
+
+    def test_respects_token_budget(self, articles):
+        cost = estimate_tokens(articles[0].blob_for_embedding)
+        batches = pack_batches(articles, max_tokens=cost * 3, max_items=100)
+        assert all(sum(estimate_tokens(a.blob_for_embedding) for a in b) <= cost * 3 for b in batches)
+        assert len(batches) > 1
+
+    def test_oversized_article_gets_own_batch(self, articles):
+        batches = pack_batches(articles[:2], max_tokens=1, max_items=100)
+        assert [len(b) for b in batches] == [1, 1]
+
+    def test_preserves_order_and_items(self, articles):
+        batches = pack_batches(articles, max_tokens=50, max_items=3)
+        assert [a for b in batches for a in b] == articles
+
+    def test_empty_input(self):
+        assert pack_batches([], max_tokens=100, max_items=10) == []
+
+
+# ============================================================
+# Token pacing
+# ============================================================
+
+class TestTokenBucket:
+    """The bucket waits only when empty and adapts its rate to 429s (AIMD)."""
+
+    def test_within_capacity_does_not_sleep(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr("src.ingestion.indexing.time.sleep", sleeps.append)
+        bucket = TokenBucket(tokens_per_minute=100)
+        bucket.acquire(40)
+        bucket.acquire(60)
+        assert sleeps == []
+
+    def test_empty_bucket_waits_for_refill(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr("src.ingestion.indexing.time.sleep", sleeps.append)
+        bucket = TokenBucket(tokens_per_minute=600)
+        bucket.acquire(600)
+        bucket.acquire(100)
+        assert len(sleeps) == 1
+        assert sleeps[0] == pytest.approx(10, abs=0.1)
+
+    def test_zero_quota_disables_pacing(self, monkeypatch):
+        sleeps = []
+        monkeypatch.setattr("src.ingestion.indexing.time.sleep", sleeps.append)
+        bucket = TokenBucket(tokens_per_minute=0)
+        for _ in range(5):
+            bucket.acquire(10_000)
+        assert sleeps == []
+
+    def test_rate_limit_halves_rate(self):
+        bucket = TokenBucket(tokens_per_minute=600)
+        bucket.on_rate_limited()
+        assert bucket.rate == pytest.approx(bucket.max_rate / 2)
+
+    def test_successes_restore_rate_additively(self):
+        bucket = TokenBucket(tokens_per_minute=600)
+        bucket.on_rate_limited()
+        for _ in range(TokenBucket.SUCCESS_STREAK):
+            bucket.on_success()
+        assert bucket.rate == pytest.approx(bucket.max_rate * 0.6)
+        for _ in range(TokenBucket.SUCCESS_STREAK * 10):
+            bucket.on_success()
+        assert bucket.rate == pytest.approx(bucket.max_rate)
+
+    def test_compute_embeddings_reports_rate_limits(self, provider):
+        from tenacity import wait_none
+        from src.ingestion.indexing import compute_embeddings
+
+        bucket = TokenBucket(tokens_per_minute=60_000)
+        provider.embed.side_effect = [Exception("429 RESOURCE_EXHAUSTED"), [[0.0]]]
+        embed = compute_embeddings.retry_with(wait=wait_none())
+        assert embed(provider, ["texte"], bucket) == [[0.0]]
+        assert bucket.rate == pytest.approx(bucket.max_rate / 2)
+
+
+# ============================================================
+# Concurrent embedding
+# ============================================================
+
+class TestEmbedBatches:
+    """embed_batches keeps several requests in flight but yields in input order."""
+
+    def test_yields_batches_in_order(self, provider, articles):
+        batches = [articles[i : i + 3] for i in range(0, len(articles), 3)]
+        results = list(embed_batches(provider, batches, concurrency=3))
+        assert [batch for batch, _ in results] == batches
+        assert all(len(batch) == len(emb) for batch, emb in results)
+
+    def test_requests_overlap_up_to_concurrency(self, provider, articles):
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+
+        def slow_embed(texts, task_type="document"):
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            time.sleep(0.02)
+            with lock:
+                active -= 1
+            return [[0.0] for _ in texts]
+
+        provider.embed.side_effect = slow_embed
+        batches = [[a] for a in articles]
+        list(embed_batches(provider, batches, concurrency=3))
+        assert 1 < peak <= 3
+
+    def test_concurrency_one_is_sequential(self, provider, articles):
+        batches = [[a] for a in articles[:3]]
+        results = list(embed_batches(provider, batches, concurrency=1))
+        assert len(results) == 3
+        assert provider.embed.call_count == 3
+
+
+# ============================================================
+# Vector assembly
+# ============================================================
+
+class TestToVectors:
+    """Each upsert tuple carries the metadata the retriever rehydrates from."""
+
+    def test_builds_id_embedding_metadata_tuples(self, articles):
+        vectors = to_vectors(articles[:2], [[0.1], [0.2]])
+        vid, emb, meta = vectors[0]
+        assert vid == articles[0].id
+        assert emb == [0.1]
+        assert meta["num"] == "R0"
+        assert meta["content"] == articles[0].content
+        assert meta["url"].endswith(articles[0].id)
@@ -7,25 +7,10 @@ A failure here means corrupted data could silently pollute the vector database.
 
 import pytest
 from pydantic import ValidationError
-from src.models import TrafficLawArticle, RetrievalResult
+from src.models import ARTICLE_LIST_ADAPTER, TrafficLawArticle, RetrievalResult
 
 
-# --- Fixtures ---
-
-@pytest.fixture
-def sample_article_data():
-    """Minimal valid article data, reusable across tests."""
-    return {
-        "id": "LEGIARTI000006841575",
-        "article_number": "R413-17",
-        "content": "Sur les autoroutes, la vitesse des véhicules est limitée à 130 km/h.",
-        "context": "Code de la route > Partie réglementaire > Livre IV > Titre I",
-    }
-
-
-@pytest.fixture
-def sample_article(sample_article_data):
-    return TrafficLawArticle(**sample_article_data)
+# sample_article_data and sample_article are shared fixtures from conftest.py.
 
 
 # ============================================================
@@ -89,6 +74,21 @@ class TestComputedFields:
         article = TrafficLawArticle(**sample_article_data)
         assert "LEGIARTI999999999999" in article.full_url
 
+    def test_computed_once_per_article(self, sample_article):
+        assert sample_article.blob_for_embedding is sample_article.blob_for_embedding
+        assert sample_article.full_url is sample_article.full_url
+
+    def test_article_is_immutable(self, sample_article):
+        """Cached computed fields stay correct because fields cannot change."""
+        sample_article.blob_for_embedding
+        with pytest.raises(ValidationError):
+            sample_article.content = "Contenu modifié après coup."
+
+    def test_computed_fields_are_serialized(self, sample_article):
+        dumped = sample_article.model_dump()
+        assert dumped["blob_for_embedding"] == sample_article.blob_for_embedding
+        assert dumped["full_url"] == sample_article.full_url
+
 
 # ============================================================
 # TrafficLawArticle — Validation (Rejection Cases)
@@ -131,6 +131,24 @@ class TestArticleValidation:
             TrafficLawArticle(**sample_article_data)
 
 
+# ============================================================
+# Bulk (de)serialization
+# ============================================================
+
+class TestArticleListAdapter:
+    """The processed corpus is validated and dumped as one list."""
+
+    def test_round_trip_matches_per_article_dump(self, sample_article, sample_article_data):
+        other = TrafficLawArticle(**{**sample_article_data, "id": "LEGIARTI000000000001"})
+        dumped = ARTICLE_LIST_ADAPTER.dump_python([sample_article, other])
+        assert dumped == [sample_article.model_dump(), other.model_dump()]
+        assert ARTICLE_LIST_ADAPTER.validate_python(dumped) == [sample_article, other]
+
+    def test_rejects_invalid_item(self, sample_article_data):
+        with pytest.raises(ValidationError):
+            ARTICLE_LIST_ADAPTER.validate_python([{**sample_article_data, "content": ""}])
+
+
 # ============================================================
 # RetrievalResult
 # ============================================================
@@ -148,7 +166,7 @@ class TestRetrievalResult:
         assert "[0.1234] R413-17" in str(result)
 
     def test_rejects_missing_score(self, sample_article):
-        with pytest.raises(ValidationError):
+        with pytest.raises(TypeError):
             RetrievalResult(article=sample_article)
 
     def test_preserves_article_computed_fields(self, sample_article):
@@ -8,9 +8,10 @@ real 2GB XML dump.
 
 import pytest
 from pathlib import Path
+from unittest.mock import MagicMock
 from lxml import etree
 
-from src.ingestion.parser import parse_xml_file, clean_text, process_directory
+from src.ingestion.parser import PARSE_CHUNKSIZE, parse_xml_file, clean_text, iter_articles, process_directory
 
 
 # --- Helpers ---
@@ -185,6 +186,20 @@ class TestParseRejection:
         result = parse_xml_file(Path("/nonexistent/file.xml"))
         assert result is None
 
+    def test_abrogated_article_skips_xml_parsing(self, tmp_path, monkeypatch):
+        """The byte prescan rejects non-VIGUEUR files before lxml runs."""
+        filepath = write_xml(tmp_path, "abrogated.xml", ABROGATED_ARTICLE_XML)
+        fromstring = MagicMock(side_effect=AssertionError("parsed"))
+        monkeypatch.setattr("src.ingestion.parser.etree.fromstring", fromstring)
+        assert parse_xml_file(filepath) is None
+        fromstring.assert_not_called()
+
+    def test_etat_beyond_prescan_still_parsed(self, tmp_path):
+        """A long header pushing ETAT past the prefix falls back to a full parse."""
+        padded = VALID_ARTICLE_XML.replace("<META>", "<META>" + "<!-- pad -->" * 500, 1)
+        filepath = write_xml(tmp_path, "padded.xml", padded)
+        assert parse_xml_file(filepath).article_number == "R413-17"
+
 
 # ============================================================
 # process_directory
@@ -203,6 +218,26 @@ class TestProcessDirectory:
         assert len(articles) == 1
         assert articles[0].article_number == "R413-17"
 
+    def test_walks_nested_directories(self, tmp_path):
+        """LEGI spreads articles over a deep directory tree."""
+        nested = tmp_path / "00" / "00" / "06"
+        nested.mkdir(parents=True)
+        write_xml(nested, "valid.xml", VALID_ARTICLE_XML)
+        write_xml(tmp_path, "fallback.xml", FALLBACK_CONTENT_XML)
+
+        articles = process_directory(tmp_path)
+        assert sorted(a.article_number for a in articles) == ["L123-4", "R413-17"]
+
+    def test_iter_articles_is_lazy(self, tmp_path):
+        """Articles are yielded one by one instead of being collected first."""
+        write_xml(tmp_path, "valid.xml", VALID_ARTICLE_XML)
+        write_xml(tmp_path, "fallback.xml", FALLBACK_CONTENT_XML)
+
+        articles = iter_articles(tmp_path)
+        assert not isinstance(articles, list)
+        assert next(articles).id.startswith("LEGIARTI")
+        assert len(list(articles)) == 1
+
     def test_empty_directory_returns_empty_list(self, tmp_path):
         articles = process_directory(tmp_path)
         assert articles == []
@@ -210,3 +245,66 @@ class TestProcessDirectory:
     def test_nonexistent_directory_returns_empty_list(self):
         articles = process_directory(Path("/does/not/exist"))
         assert articles == []
+
+    def test_process_pool_matches_serial_parsing(self, tmp_path):
+        """Large directories go through the process pool with the same result."""
+        for i in range(PARSE_CHUNKSIZE + 6):
+            xml = VALID_ARTICLE_XML.replace("LEGIARTI000006841575", f"LEGIARTI{i:012d}")
+            write_xml(tmp_path, f"article_{i}.xml", xml)
+        write_xml(tmp_path, "old.xml", ABROGATED_ARTICLE_XML)
+
+        serial = process_directory(tmp_path, max_workers=1)
+        parallel = process_directory(tmp_path, max_workers=2)
+        assert len(parallel) == PARSE_CHUNKSIZE + 6
+        assert parallel == serial
+
+    def test_pool_keeps_a_bounded_window_in_flight(self, tmp_path, monkeypatch):
+        """Only a few batches are submitted ahead; closing early cancels the rest."""
+        from concurrent.futures import ThreadPoolExecutor
+
+        submitted = []
+
+        class SpyExecutor(ThreadPoolExecutor):
+            def submit(self, fn, *args, **kwargs):
+                submitted.append(args)
+                return super().submit(fn, *args, **kwargs)
+
+        monkeypatch.setattr("src.ingestion.parser.PARSE_CHUNKSIZE", 2)
+        monkeypatch.setattr("src.ingestion.parser.ProcessPoolExecutor", SpyExecutor)
+        for i in range(40):
+            xml = VALID_ARTICLE_XML.replace("LEGIARTI000006841575", f"LEGIARTI{i:012d}")
+            write_xml(tmp_path, f"article_{i}.xml", xml)
+
+        articles = iter_articles(tmp_path, max_workers=2)
+        next(articles)
+        articles.close()
+        assert len(submitted) <= 2 * 2 + 1
+
+
+# ============================================================
+# Processed file
+# ============================================================
+
+class TestProcessedFile:
+    """main() writes the corpus JSON that the indexer loads back."""
+
+    def test_written_file_round_trips(self, tmp_path, monkeypatch):
+        import json
+        from src.config import settings
+        from src.ingestion.parser import main
+        from src.ingestion.indexing import load_validated_data
+
+        raw_dir = tmp_path / "raw"
+        raw_dir.mkdir()
+        write_xml(raw_dir, "valid.xml", VALID_ARTICLE_XML)
+        write_xml(raw_dir, "fallback.xml", FALLBACK_CONTENT_XML)
+        output = tmp_path / "processed" / "articles.json"
+        monkeypatch.setitem(settings.__dict__, "RAW_DATA_DIR", raw_dir)
+        monkeypatch.setitem(settings.__dict__, "PROCESSED_FILE", output)
+
+        main()
+
+        articles = process_directory(raw_dir, max_workers=1)
+        expected = json.dumps([a.model_dump() for a in articles], ensure_ascii=False, indent=2)
+        assert output.read_text(encoding="utf-8") == expected
+        assert load_validated_data() == articles
@@ -7,7 +7,7 @@ No API calls needed -- pure unit tests on the predicate function.
 
 import pytest
 
-from src.providers import _is_query_retriable
+from src.providers import _find_intent, _is_query_retriable
 
 
 class TestRetriablePredicate:
@@ -52,3 +52,137 @@ class TestRetriablePredicate:
 
     def test_unknown_error_is_not_retriable(self):
         assert _is_query_retriable(ValueError("something unexpected")) is False
+
+
+class TestFindIntent:
+    """_find_intent scans schema-constrained (Gemini) output for an intent value."""
+
+    def test_reads_intent_without_json(self):
+        assert _find_intent('{"intent": "CHITCHAT"}') == "CHITCHAT"
+
+    def test_tolerates_partial_json(self):
+        assert _find_intent('{"intent": "OFF_TOPIC') == "OFF_TOPIC"
+
+    def test_unknown_value_is_none(self):
+        assert _find_intent('{"intent": "UNKNOWN"}') is None
+
+
+class TestUnconstrainedClassifierOutput:
+    """Ollama and Groq only guarantee JSON, so the "intent" key is read, not the first value seen."""
+
+    RAW = '{"reason": "pas OFF_TOPIC, c est du code", "intent": "LEGAL_QUERY"}'
+
+    def test_ollama_reads_intent_key(self):
+        from unittest.mock import patch
+        from src.providers import OllamaProvider
+
+        with patch("ollama.Client"):
+            provider = OllamaProvider()
+        provider._client.chat.return_value = {"message": {"content": self.RAW}}
+        assert provider.classify_intent("Vitesse ?", "system")["intent"] == "LEGAL_QUERY"
+
+    def test_groq_reads_intent_key(self, monkeypatch):
+        from unittest.mock import MagicMock, patch
+        from src.providers import GroqProvider
+
+        monkeypatch.setattr("src.providers.settings.GROQ_API_KEY", "test-key")
+        with patch("groq.Groq"), patch("src.providers.GeminiProvider"):
+            provider = GroqProvider()
+        provider._client.chat.completions.create.return_value.choices = [
+            MagicMock(message=MagicMock(content=self.RAW))
+        ]
+        assert provider.classify_intent("Vitesse ?", "system")["intent"] == "LEGAL_QUERY"
+
+
+@pytest.fixture
+def provider():
+    """GeminiProvider backed by a mocked genai client (no network)."""
+    from unittest.mock import patch
+    from src.clients import get_genai_client
+    from src.providers import GeminiProvider
+
+    get_genai_client.cache_clear()
+    with patch("google.genai.Client"):
+        yield GeminiProvider()
+    get_genai_client.cache_clear()
+
+
+class TestGeminiConfigReuse:
+    """GenerateContentConfig objects are built once per distinct setting."""
+
+    def test_same_settings_reuse_config(self, provider):
+        first = provider._generation_config("system", 0.0, 100)
+        assert provider._generation_config("system", 0.0, 100) is first
+
+    def test_different_settings_build_new_config(self, provider):
+        first = provider._generation_config("system", 0.0, 100)
+        assert provider._generation_config("other", 0.0, 100) is not first
+
+    def test_classifier_config_built_once_per_system(self, provider):
+        first = provider._classifier_config("system")
+        assert provider._classifier_config("system") is first
+        assert first.response_mime_type == "application/json"
+
+    def test_providers_share_one_client(self, provider):
+        from src.providers import GeminiProvider
+
+        assert GeminiProvider().client is provider.client
+
+
+class TestGeminiStreamedClassification:
+    """classify_intent returns as soon as an intent value shows up in the stream."""
+
+    @staticmethod
+    def _chunks(*texts):
+        from unittest.mock import MagicMock
+
+        for text in texts:
+            yield MagicMock(text=text)
+
+    def test_returns_on_first_recognizable_intent(self, provider):
+        consumed = []
+
+        def stream():
+            for chunk in self._chunks('{"intent": "OFF_', 'TOPIC', '"}'):
+                consumed.append(chunk.text)
+                yield chunk
+
+        provider.client.models.generate_content_stream.return_value = stream()
+        assert provider.classify_intent("Recette ?", "system") == {"intent": "OFF_TOPIC"}
+        assert consumed == ['{"intent": "OFF_', "TOPIC"]
+
+    def test_falls_back_to_json_parsing(self, provider):
+        provider.client.models.generate_content_stream.return_value = self._chunks('{"intent": ', '"UNKNOWN"}')
+        assert provider.classify_intent("Question", "system") == {"intent": "UNKNOWN"}
+
+
+class TestGeminiStreamRetry:
+    """generate_stream retries a failed request, but never restarts a stream it has yielded from."""
+
+    @staticmethod
+    def _failing_stream(*texts):
+        from unittest.mock import MagicMock
+
+        for text in texts:
+            yield MagicMock(text=text)
+        raise Exception("503 UNAVAILABLE")
+
+    def test_retries_before_first_chunk(self, provider, monkeypatch):
+        from unittest.mock import MagicMock
+
+        monkeypatch.setattr("src.providers.time.sleep", lambda s: None)
+        provider.client.models.generate_content_stream.side_effect = [
+            Exception("503 UNAVAILABLE"),
+            iter([MagicMock(text="La vitesse est limitée.")]),
+        ]
+        assert list(provider.generate_stream("Vitesse ?", "system")) == ["La vitesse est limitée."]
+
+    def test_does_not_replay_after_partial_output(self, provider, monkeypatch):
+        monkeypatch.setattr("src.providers.time.sleep", lambda s: None)
+        provider.client.models.generate_content_stream.side_effect = lambda **kw: self._failing_stream("La vitesse ")
+        received = []
+        with pytest.raises(Exception, match="503"):
+            for piece in provider.generate_stream("Vitesse ?", "system"):
+                received.append(piece)
+        assert received == ["La vitesse "]
+        provider.client.models.generate_content_stream.assert_called_once()
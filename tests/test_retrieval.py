@@ -7,7 +7,33 @@ itself is evaluated separately via the evaluation dataset.
 """
 
 import pytest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+from src.clients import get_pinecone_client, get_pinecone_index
 from src.models import TrafficLawArticle, RetrievalResult
+from src.providers import LLMProvider
+from src.retrieval import TrafficRetriever
+
+
+# --- Fixtures ---
+
+@pytest.fixture
+def retriever():
+    """TrafficRetriever over a mocked provider and a mocked Pinecone client."""
+    provider = MagicMock(spec=LLMProvider)
+    provider.embed.return_value = [[0.1, 0.2, 0.3]]
+    get_pinecone_client.cache_clear()
+    get_pinecone_index.cache_clear()
+    with patch("pinecone.Pinecone"):
+        yield TrafficRetriever(provider)
+    get_pinecone_client.cache_clear()
+    get_pinecone_index.cache_clear()
+
+
+def _match(article_id: str, score: float, **meta) -> SimpleNamespace:
+    """Pinecone-like match object carrying the given metadata."""
+    return SimpleNamespace(id=article_id, score=score, metadata={"article_id": article_id, **meta})
 
 
 # ============================================================
@@ -77,6 +103,15 @@ class TestResultRehydration:
         assert "130 km/h" in article.content
         assert "Livre IV" not in article.content  # context is separate
 
+    def test_invalid_match_is_skipped(self, retriever):
+        """Rehydration still validates: a match with unusable content is dropped, not returned."""
+        retriever.index.query.return_value.matches = [
+            _match("LEGIARTI000000000001", 0.9, num="R1", content="Contenu de l'article.", category="Code"),
+            _match("LEGIARTI000000000002", 0.8, num="R2"),
+        ]
+        results = retriever.search_by_vector([0.1, 0.2, 0.3], k=2)
+        assert [r.article.id for r in results] == ["LEGIARTI000000000001"]
+
 
 # ============================================================
 # Query Validation
@@ -133,3 +168,53 @@ class TestResultOrdering:
         sorted_results = sorted(results, key=lambda r: r.score, reverse=True)
         assert sorted_results[0].score == 0.92
         assert sorted_results[-1].score == 0.55
+
+
+# ============================================================
+# Score Threshold
+# ============================================================
+
+class TestScoreThreshold:
+    """min_score keeps only matches strictly above it; Pinecone returns them best first."""
+
+    def test_min_score_drops_low_matches(self, retriever):
+        meta = {"content": "Contenu de l'article.", "category": "Code"}
+        retriever.index.query.return_value.matches = [
+            _match(f"LEGIARTI{i:012d}", score, num=f"R{i}", **meta)
+            for i, score in enumerate([0.9, 0.6, 0.5, 0.2], start=1)
+        ]
+        results = retriever.search_by_vector([0.1, 0.2, 0.3], k=4, min_score=0.5)
+        assert [r.score for r in results] == [0.9, 0.6]
+        assert len(retriever.search_by_vector([0.1, 0.2, 0.3], k=4)) == 4
+
+
+# ============================================================
+# Query Embedding
+# ============================================================
+
+class TestQueryEmbedding:
+    """embed_query is memoized so routing and search share one embedding call."""
+
+    def test_repeated_query_embeds_once(self, retriever):
+        first = retriever.embed_query("Vitesse autoroute ?")
+        second = retriever.embed_query("vitesse  autoroute ?")
+        assert first == second
+        retriever.provider.embed.assert_called_once_with(["Vitesse autoroute ?"], task_type="query")
+
+    def test_search_reuses_query_embedding(self, retriever):
+        retriever.index.query.return_value.matches = []
+        retriever.embed_query("Vitesse autoroute ?")
+        retriever.search("Vitesse autoroute ?")
+        retriever.provider.embed.assert_called_once()
+
+    def test_embeddings_are_not_shared_across_providers(self, retriever):
+        other_provider = MagicMock(spec=LLMProvider)
+        other_provider.embed.return_value = [[0.9, 0.8, 0.7]]
+        other = TrafficRetriever(other_provider)
+
+        retriever.embed_query("Vitesse autoroute ?")
+        assert other.embed_query("Vitesse autoroute ?") == [0.9, 0.8, 0.7]
+        other_provider.embed.assert_called_once()
+
+    def test_retrievers_share_one_index_handle(self, retriever):
+        assert TrafficRetriever(retriever.provider).index is retriever.index